@@ -34,29 +34,21 @@ class AudioAnalyzer:
             # Convert bytes to numpy array
             samples = np.frombuffer(audio_data, dtype=np.int16)
 
-            # Calculate amplitude envelope
+            # Calculate amplitude envelope: one row of samples per video frame
             samples_per_frame = int(sample_rate / target_fps)
             n_video_frames = len(samples) // samples_per_frame
+            frames = samples[:n_video_frames * samples_per_frame].reshape(n_video_frames, samples_per_frame)
 
-            amplitudes = []
-            for i in range(n_video_frames):
-                start = i * samples_per_frame
-                end = start + samples_per_frame
-                frame_samples = samples[start:end]
+            # Calculate RMS (root mean square) amplitude
+            rms = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
 
-                # Calculate RMS (root mean square) amplitude
-                rms = np.sqrt(np.mean(frame_samples.astype(float) ** 2))
+            # Normalize to 0-1 range
+            normalized = np.minimum(rms / self.config.amplitude_max, 1.0)
 
-                # Normalize to 0-1 range
-                normalized = min(rms / self.config.amplitude_max, 1.0)
+            # Apply threshold
+            normalized[normalized < self.config.amplitude_threshold] = 0.0
 
-                # Apply threshold
-                if normalized < self.config.amplitude_threshold:
-                    normalized = 0.0
-
-                amplitudes.append(normalized)
-
-            return amplitudes
+            return normalized.tolist()
 
     def smooth_amplitude(self, amplitudes: List[float], window_size: int | None = None) -> List[float]:
         """
@@ -75,14 +67,18 @@ class AudioAnalyzer:
         if window_size <= 1:
             return amplitudes
 
-        smoothed = []
-        for i in range(len(amplitudes)):
-            start = max(0, i - window_size // 2)
-            end = min(len(amplitudes), i + window_size // 2 + 1)
-            window = amplitudes[start:end]
-            smoothed.append(sum(window) / len(window))
+        n = len(amplitudes)
+        if n == 0:
+            return []
+
+        # Centered moving average, with the window truncated at the edges
+        idx = np.arange(n)
+        start = np.maximum(0, idx - window_size // 2)
+        end = np.minimum(n, idx + window_size // 2 + 1)
+        cumsum = np.concatenate(([0.0], np.cumsum(amplitudes, dtype=np.float64)))
+        smoothed = (cumsum[end] - cumsum[start]) / (end - start)
 
-        return smoothed
+        return smoothed.tolist()
 
     def get_audio_info(self, audio_path: str) -> dict:
         """
@@ -137,6 +137,23 @@ class SadTalkerRenderer:
                 self.logger.error(f"Error running SadTalker: {e}")
                 raise
 
+    def preextract_options(self) -> dict:
+        """Keyword arguments for sadtalker_worker.preextract matching this renderer's config."""
+        return {
+            # Workers chdir into the SadTalker repo, so relative paths would break
+            "source_image": str(self.source_image.resolve()),
+            "preprocess": self.config.sadtalker_preprocess or "crop",
+        }
+
+    def worker_options(self) -> dict:
+        """Keyword arguments for sadtalker_worker.generate matching this renderer's config."""
+        return {
+            "source_image": str(self.source_image.resolve()),
+            "still": self.config.sadtalker_still_mode,
+            "preprocess": self.config.sadtalker_preprocess or "crop",
+            "enhancer": "gfpgan" if self.config.sadtalker_use_enhancer else None,
+        }
+
     def cleanup(self):
         """Cleanup resources."""
         pass
@@ -0,0 +1,378 @@
+"""
+SadTalker worker for process pools.
+
+Running SadTalker's inference.py per request reloads every checkpoint (~10s)
+and blocks the caller. This module loads the SadTalker models once per worker
+process (via init_worker as a ProcessPoolExecutor initializer) and exposes
+generate(audio_bytes) -> mp4 bytes for use with loop.run_in_executor.
+
+Mirrors the pipeline in SadTalker's inference.py:
+source image → 3DMM coefficients → audio → motion coefficients → face render.
+"""
+import hashlib
+import multiprocessing.util
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import types
+from pathlib import Path
+from typing import Optional
+
+from ..utils import get_logger
+
+logger = get_logger("vidchat.sadtalker")
+
+# Per-process state, set by init_worker
+_models: Optional[dict] = None
+_sadtalker_path: Optional[Path] = None
+_source_cache: dict = {}  # (source_image, mtime, preprocess) -> (first_coeff_path, crop_pic_path, crop_info)
+_source_cache_dir: Optional[Path] = None  # On-disk copy of the above, keyed by image hash
+_source_scratch_dir: Optional[Path] = None  # Holds the files of in-memory entries without a cache dir
+
+# Intermediate files (cropped frame, .mat coefficients, raw render) go to RAM when possible
+_SCRATCH_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def _no_tqdm(iterable=None, *args, **kwargs):
+    """Stand-in for tqdm: progress bars cost per-iteration overhead and nobody sees them."""
+    return iterable
+
+
+def _disable_tqdm():
+    """Replace tqdm before SadTalker imports it (it uses `from tqdm import tqdm`)."""
+    try:
+        import tqdm
+    except ImportError:
+        return
+    tqdm.tqdm = _no_tqdm
+
+
+def init_worker(
+    sadtalker_path: str,
+    device: Optional[str] = None,
+    size: int = 256,
+    preprocess: str = "crop",
+    old_version: bool = False,
+    compile_generator: bool = False,
+    precision: str = "fp32",
+    source_cache_dir: Optional[str] = None,
+):
+    """
+    Load SadTalker models into this process.
+
+    Args:
+        sadtalker_path: SadTalker installation directory
+        device: "cuda" or "cpu" (auto-detected if None)
+        size: Face render size (256 or 512)
+        preprocess: Preprocess mode the checkpoints are configured for
+        old_version: Use the old (.pth) checkpoint layout
+        compile_generator: torch.compile the face render generator (CUDA only)
+        precision: Face render precision: "fp32", "fp16" or "bf16" (CUDA only)
+        source_cache_dir: Directory to persist source image coefficients in
+            across restarts (None = keep them in memory only)
+    """
+    global _models, _sadtalker_path, _source_cache_dir
+
+    # Resolved before the chdir below so relative paths keep their meaning
+    _sadtalker_path = Path(sadtalker_path).resolve()
+    if source_cache_dir:
+        _source_cache_dir = Path(source_cache_dir).resolve()
+        _source_cache_dir.mkdir(parents=True, exist_ok=True)
+    # SadTalker uses imports and config paths relative to its repo root
+    sys.path.insert(0, str(_sadtalker_path))
+    os.chdir(_sadtalker_path)
+    _disable_tqdm()
+
+    import torch
+    from src.utils.init_path import init_path
+    from src.utils.preprocess import CropAndExtract
+    from src.test_audio2coeff import Audio2Coeff
+    from src.facerender.animate import AnimateFromCoeff
+
+    if device is None:
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+
+    paths = init_path(
+        str(_sadtalker_path / "checkpoints"),
+        str(_sadtalker_path / "src" / "config"),
+        size,
+        old_version,
+        preprocess,
+    )
+
+    audio_to_coeff = Audio2Coeff(paths, device)
+    audio2exp = audio_to_coeff.audio2exp_model
+    audio2exp.test = types.MethodType(_batched_audio2exp_test, audio2exp)
+
+    animate_from_coeff = AnimateFromCoeff(paths, device)
+    if precision != "fp32":
+        _autocast_generator(animate_from_coeff, device, precision)
+    if compile_generator:
+        _compile_generator(animate_from_coeff, device)
+
+    _models = {
+        "device": device,
+        "size": size,
+        "preprocess_model": CropAndExtract(paths, device),
+        "audio_to_coeff": audio_to_coeff,
+        "animate_from_coeff": animate_from_coeff,
+    }
+
+
+def _batched_audio2exp_test(self, batch):
+    """
+    Audio2Exp.test without the per-10-frame Python loop.
+
+    SadTalker's netG maps each mel window independently (the 10-frame slices
+    are only flattened into the batch dimension), so the whole clip can go
+    through in one call: one set of kernel launches instead of T/10.
+    """
+    mel_input = batch["indiv_mels"]  # bs T 1 80 16
+    bs, T = mel_input.shape[0], mel_input.shape[1]
+    audiox = mel_input.view(-1, 1, 80, 16)
+    ref = batch["ref"][:, :T, :64]
+    ratio = batch["ratio_gt"][:, :T]
+    exp_coeff_pred = self.netG(audiox, ref, ratio)  # bs T 64
+    return {"exp_coeff_pred": exp_coeff_pred.view(bs, T, -1)}
+
+
+def _autocast_generator(animate_from_coeff, device: str, precision: str):
+    """
+    Run the face render generator under autocast with channels-last tensors.
+
+    Only the generator is affected; the keypoint, mapping and audio nets stay
+    FP32 so coefficient prediction doesn't drift. Weights stay FP32 as well
+    (autocast casts per op), which keeps the normalization layers stable.
+    """
+    import torch
+
+    dtypes = {"fp16": torch.float16, "bf16": torch.bfloat16}
+    if precision not in dtypes:
+        raise ValueError(f"Unknown SadTalker precision: {precision} (use fp32, fp16 or bf16)")
+    if device != "cuda":
+        logger.warning(f"{precision} face render needs CUDA, using fp32")
+        return
+
+    dtype = dtypes[precision]
+    generator = animate_from_coeff.generator.to(memory_format=torch.channels_last)
+
+    def forward(source_image, **kwargs):
+        with torch.autocast("cuda", dtype=dtype):
+            out = generator(source_image.to(memory_format=torch.channels_last), **kwargs)
+        # Frames are written out as float images downstream
+        out["prediction"] = out["prediction"].float()
+        return out
+
+    animate_from_coeff.generator = forward
+
+
+def _compile_generator(animate_from_coeff, device: str):
+    """
+    Compile the face render generator, which dominates render time.
+
+    make_animation is handed animate_from_coeff.generator on every call, so
+    replacing the attribute is enough. "reduce-overhead" captures CUDA graphs,
+    which pays off because the generator runs once per frame batch at a fixed
+    shape. Compilation happens on the first batch, i.e. during warm-up traffic.
+    """
+    import torch
+
+    if device != "cuda" or not hasattr(torch, "compile"):
+        logger.warning("torch.compile needs CUDA and torch>=2.0, face render runs eagerly")
+        return
+    animate_from_coeff.generator = torch.compile(animate_from_coeff.generator, mode="reduce-overhead")
+
+
+def warm_up() -> bool:
+    """No-op task; submitting it forces the pool to start and initialize a worker."""
+    return _models is not None
+
+
+def preextract(source_image: str, preprocess: str = "crop") -> bool:
+    """
+    Extract (and cache) the source image's 3DMM coefficients.
+
+    The extraction only depends on the avatar image, so it can run while the
+    speech audio is still being synthesized. Later calls return immediately.
+
+    Returns:
+        True if a face was found
+    """
+    return _source_coeffs(source_image, preprocess)[0] is not None
+
+
+def _source_coeffs(source_image: str, preprocess: str) -> tuple:
+    """
+    CropAndExtract output for a source image.
+
+    Kept in memory for the worker's lifetime and, with a source cache dir,
+    on disk under the image's sha1 so restarts don't redo the extraction.
+    """
+    if _models is None:
+        raise RuntimeError("SadTalker worker not initialized (init_worker was not run)")
+
+    key = (source_image, os.stat(source_image).st_mtime_ns, preprocess)
+    if key in _source_cache:
+        return _source_cache[key]
+
+    size = _models["size"]
+    if _source_cache_dir is None:
+        result = _extract_source_coeffs(source_image, preprocess, _scratch_source_dir())
+        if result[0] is not None:
+            _drop_stale_sources(source_image, preprocess)
+            _source_cache[key] = result
+        return result
+
+    digest = hashlib.sha1(Path(source_image).read_bytes()).hexdigest()
+    first_frame_dir = _source_cache_dir / f"{digest}_{preprocess}_{size}"
+    result = _load_source_coeffs(first_frame_dir)
+    if result is None:
+        result = _persist_source_coeffs(source_image, preprocess, first_frame_dir)
+    if result[0] is not None:
+        _source_cache[key] = result
+    return result
+
+
+def _extract_source_coeffs(source_image: str, preprocess: str, first_frame_dir: Path) -> tuple:
+    """Run CropAndExtract into first_frame_dir (removed again if no face is found)."""
+    result = _models["preprocess_model"].generate(
+        source_image, str(first_frame_dir), preprocess, source_image_flag=True, pic_size=_models["size"]
+    )
+    if result[0] is None:
+        shutil.rmtree(first_frame_dir, ignore_errors=True)
+    return result
+
+
+def _scratch_source_dir() -> Path:
+    """New directory for in-memory cached coefficients, removed when the worker exits."""
+    global _source_scratch_dir
+
+    if _source_scratch_dir is None:
+        _source_scratch_dir = Path(tempfile.mkdtemp(prefix="sadtalker_source_", dir=_SCRATCH_DIR))
+        # Pool workers leave through os._exit, which skips atexit but runs finalizers
+        multiprocessing.util.Finalize(
+            None, shutil.rmtree, args=(_source_scratch_dir,), kwargs={"ignore_errors": True}, exitpriority=0
+        )
+    return Path(tempfile.mkdtemp(dir=_source_scratch_dir))
+
+
+def _drop_stale_sources(source_image: str, preprocess: str):
+    """Forget (and delete) entries for an older version of a source image."""
+    for key in [k for k in _source_cache if k[0] == source_image and k[2] == preprocess]:
+        first_coeff_path = _source_cache.pop(key)[0]
+        shutil.rmtree(Path(first_coeff_path).parent, ignore_errors=True)
+
+
+def _persist_source_coeffs(source_image: str, preprocess: str, first_frame_dir: Path) -> tuple:
+    """
+    Extract into a private temp dir and move it into place in one rename.
+
+    Several workers may extract the same image at once; each writes its own
+    temp dir, and whichever loses the rename uses the winner's copy.
+    """
+    temp_dir = Path(tempfile.mkdtemp(prefix=f".{first_frame_dir.name}.", dir=_source_cache_dir))
+    result = _extract_source_coeffs(source_image, preprocess, temp_dir)
+    if result[0] is None:
+        return result
+
+    # Point the persisted paths at the final location before it exists
+    first_coeff_path, crop_pic_path, crop_info = result
+    result = (
+        str(first_frame_dir / Path(first_coeff_path).relative_to(temp_dir)),
+        str(first_frame_dir / Path(crop_pic_path).relative_to(temp_dir)),
+        crop_info,
+    )
+    with open(temp_dir / "result.pkl", "wb") as f:
+        pickle.dump(result, f)
+
+    try:
+        os.replace(temp_dir, first_frame_dir)
+    except OSError:
+        # Target exists: either another worker's complete entry or a broken one
+        existing = _load_source_coeffs(first_frame_dir)
+        if existing is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return existing
+        shutil.rmtree(first_frame_dir, ignore_errors=True)
+        os.replace(temp_dir, first_frame_dir)
+    return result
+
+
+def _load_source_coeffs(first_frame_dir: Path) -> Optional[tuple]:
+    """Load a persisted CropAndExtract result if it and its files are intact."""
+    try:
+        with open(first_frame_dir / "result.pkl", "rb") as f:
+            result = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    first_coeff_path, crop_pic_path, _ = result
+    if not (os.path.exists(first_coeff_path) and os.path.exists(crop_pic_path)):
+        return None
+    return result
+
+
+def generate(
+    audio_bytes: bytes,
+    source_image: str,
+    still: bool = False,
+    preprocess: str = "crop",
+    enhancer: Optional[str] = None,
+    pose_style: int = 0,
+    expression_scale: float = 1.0,
+    batch_size: int = 2,
+) -> bytes:
+    """
+    Generate a talking head video.
+
+    Args:
+        audio_bytes: WAV file contents
+        source_image: Avatar image path (absolute: workers run in the SadTalker dir)
+        still: Reduce head motion
+        preprocess: "crop" or "full"
+        enhancer: Face enhancer ("gfpgan") or None
+        pose_style: Pose style index (0-45)
+        expression_scale: Expression intensity
+        batch_size: Face render batch size
+
+    Returns:
+        MP4 file contents
+    """
+    if _models is None:
+        raise RuntimeError("SadTalker worker not initialized (init_worker was not run)")
+
+    from src.generate_batch import get_data
+    from src.generate_facerender_batch import get_facerender_data
+
+    device = _models["device"]
+    size = _models["size"]
+
+    with tempfile.TemporaryDirectory(dir=_SCRATCH_DIR) as temp_dir:
+        save_dir = Path(temp_dir)
+        audio_path = save_dir / "audio.wav"
+        audio_path.write_bytes(audio_bytes)
+
+        # Source image → 3DMM coefficients (cached per worker)
+        first_coeff_path, crop_pic_path, crop_info = _source_coeffs(source_image, preprocess)
+        if first_coeff_path is None:
+            raise RuntimeError(f"Could not extract face coefficients from {source_image}")
+
+        # Audio → motion coefficients
+        batch = get_data(first_coeff_path, str(audio_path), device, None, still=still)
+        coeff_path = _models["audio_to_coeff"].generate(batch, str(save_dir), pose_style, None)
+
+        # Coefficients → video
+        data = get_facerender_data(
+            coeff_path, crop_pic_path, first_coeff_path, str(audio_path), batch_size,
+            None, None, None,
+            expression_scale=expression_scale, still_mode=still, preprocess=preprocess, size=size,
+        )
+        result = _models["animate_from_coeff"].generate(
+            data, str(save_dir), source_image, crop_info,
+            enhancer=enhancer, background_enhancer=None, preprocess=preprocess, img_size=size,
+        )
+
+        video_path = save_dir / "result.mp4"
+        shutil.move(result, video_path)
+        return video_path.read_bytes()
@@ -472,6 +472,11 @@ def start_ollama(background: bool = False):
             console.print("\n[yellow]Ollama stopped[/yellow]")
 
 
+def _server_cmd(host: str, port: int) -> list[str]:
+    """Web server command line (uvicorn options are set by vidchat.web.server.start_server)."""
+    return ["uv", "run", "python", "-m", "vidchat.web", "--host", host, "--port", str(port)]
+
+
 def start_web(host: str = "127.0.0.1", port: int = 8000, background: bool = False):
     """Start web server."""
     status = check_web_server_status()
@@ -495,8 +500,7 @@ def start_web(host: str = "127.0.0.1", port: int = 8000, background: bool = Fals
 
     if background:
         subprocess.Popen(
-            ["uv", "run", "uvicorn", "vidchat.web.server:app",
-             "--host", host, "--port", str(port)],
+            _server_cmd(host, port),
             cwd=PROJECT_ROOT,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
@@ -514,8 +518,7 @@ def start_web(host: str = "127.0.0.1", port: int = 8000, background: bool = Fals
         console.print("Press Ctrl+C to stop")
         try:
             subprocess.run(
-                ["uv", "run", "uvicorn", "vidchat.web.server:app",
-                 "--host", host, "--port", str(port)],
+                _server_cmd(host, port),
                 cwd=PROJECT_ROOT
             )
         except KeyboardInterrupt:
@@ -977,6 +980,7 @@ def train_model(
         epochs = config.get('voice_training', {}).get('epochs', 300)
     if batch_size is None:
         batch_size = config.get('voice_training', {}).get('batch_size', 4)
+    copy_mode = config.get('voice_training', {}).get('copy_mode', 'symlink')
 
     console.print(f"[green]✓[/green] Voice name: [cyan]{voice_name}[/cyan]")
     console.print(f"[green]✓[/green] Epochs: {epochs}")
@@ -998,6 +1002,7 @@ def train_model(
         voice_name,
         "--epochs", str(epochs),
         "--batch-size", str(batch_size),
+        "--copy-mode", copy_mode,
     ]
 
     if use_gpu:
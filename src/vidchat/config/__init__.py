@@ -7,6 +7,7 @@ from .settings import (
     AIAgentConfig,
     AudioConfig,
     RVCConfig,
+    CacheConfig,
     default_config,
 )
 
@@ -17,5 +18,6 @@ __all__ = [
     "AIAgentConfig",
     "AudioConfig",
     "RVCConfig",
+    "CacheConfig",
     "default_config",
 ]
@@ -27,6 +27,9 @@ class TTSConfig:
     piper_model: str = str(MODELS_DIR / "en_US-lessac-medium.onnx")
     rvc_model: str | None = None  # Path to RVC model (for voice conversion)
     sample_rate: int = 22050
+    piper_persistent: bool = True  # Keep one piper process alive across calls (if piper has --json-input)
+    piper_timeout: float = 30.0  # Seconds to wait for the persistent process before one-shot mode
+    device: str = "auto"  # Piper ONNX execution device: auto, cuda or cpu
 
     # XTTS voice cloning settings
     xtts_reference_audio: str | None = None  # Path to reference audio (6+ seconds)
@@ -64,6 +67,9 @@ class AvatarConfig:
     sadtalker_use_enhancer: bool = False  # Use GFPGAN enhancer (disabled - not compatible with Python 3.13+)
     sadtalker_still_mode: bool = False  # Less head movement
     sadtalker_preprocess: str = "crop"  # crop or full
+    sadtalker_workers: int = 1  # Warm worker processes with models loaded (0 = run inference.py per request)
+    sadtalker_compile: bool = False  # torch.compile the face render generator in workers (CUDA only)
+    sadtalker_precision: str = "fp32"  # Face render precision in workers: fp32, fp16 or bf16 (CUDA only)
 
 
 @dataclass
@@ -105,6 +111,29 @@ class RVCConfig:
     learning_rate: float = 0.0001
 
 
+@dataclass
+class CacheConfig:
+    """Response cache configuration (text, audio and video per prompt)."""
+    enabled: bool = True
+    cache_dir: str = str(DATA_DIR / "response_cache")
+    max_entries: int = 256  # Least recently used entries are evicted beyond this
+
+    # Semantic matching (requires sentence-transformers; faiss optional)
+    semantic: bool = True
+    similarity_threshold: float = 0.95  # Cosine similarity for a semantic hit
+    embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+
+    # Prompts answered and rendered at server startup (also warms the CUDA kernels)
+    precache_prompts: list[str] = field(default_factory=lambda: ["Hello!"])
+
+    # SadTalker source image coefficients (3DMM), persisted per image hash
+    source_coeff_dir: str = str(DATA_DIR / "src_coeffs")
+
+    # Generated videos served over HTTP (/api/video/<id>); oldest are deleted beyond the limit
+    video_dir: str = str(DATA_DIR / "videos")
+    max_served_videos: int = 64
+
+
 @dataclass
 class AppConfig:
     """Main application configuration."""
@@ -116,6 +145,7 @@ class AppConfig:
     ai: AIAgentConfig = field(default_factory=AIAgentConfig)
     audio: AudioConfig = field(default_factory=AudioConfig)
     rvc: RVCConfig = field(default_factory=RVCConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
 
     # Feature flags
     enable_audio_sync: bool = True
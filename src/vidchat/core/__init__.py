@@ -1,5 +1,6 @@
 """Core agent module."""
 
 from .agent import VidChatAgent
+from .response_cache import ResponseCache
 
-__all__ = ["VidChatAgent"]
+__all__ = ["VidChatAgent", "ResponseCache"]
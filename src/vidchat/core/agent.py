@@ -7,6 +7,7 @@ import asyncio
 import tempfile
 import os
 from pathlib import Path
+from typing import AsyncIterator
 
 from pydantic_ai import Agent
 from pydantic_ai.models.openai import OpenAIChatModel
@@ -113,6 +114,22 @@ class VidChatAgent:
 
         return response_text
 
+    async def chat_stream(self, user_input: str) -> AsyncIterator[str]:
+        """
+        Process user input and stream the AI response as it is generated.
+
+        Args:
+            user_input: User's message
+
+        Yields:
+            Response text deltas
+        """
+        print(f"\n[You]: {user_input}")
+
+        async with self.ai_agent.run_stream(user_input) as result:
+            async for delta in result.stream_text(delta=True):
+                yield delta
+
     def generate_speech(self, text: str, output_path: str | None = None) -> str:
         """
         Generate speech audio from text.
@@ -0,0 +1,267 @@
+"""
+Response cache for VidChat.
+
+Stores the response text, speech audio and SadTalker video for a prompt on disk,
+so that repeated prompts skip the LLM, TTS and video generation entirely.
+
+Two lookup tiers:
+1. Exact match on the normalized prompt (sha256 key)
+2. Semantic match: cosine similarity of sentence embeddings above a threshold
+   (requires sentence-transformers; uses FAISS for search when installed)
+"""
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+from ..config import AppConfig, CacheConfig
+from ..utils import get_logger
+
+# Checked without importing: both pull in torch, and this module is imported
+# with vidchat.core even when the semantic tier is off
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+FAISS_AVAILABLE = importlib.util.find_spec("faiss") is not None
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(text: str) -> str:
+    """Normalize a prompt for cache keys (case, whitespace, trailing punctuation)."""
+    return _WHITESPACE.sub(" ", text.lower()).strip().rstrip("?!. ")
+
+
+def cache_context(config: AppConfig) -> str:
+    """
+    Fingerprint of the settings that shape a cached response.
+
+    Cached text, audio and video are only valid for the LLM, voice and avatar
+    that produced them; changing any of these invalidates the cache.
+    """
+    avatar = config.avatar.avatar_image or ""
+    try:
+        avatar_mtime = os.stat(avatar).st_mtime_ns if avatar else 0
+    except OSError:
+        avatar_mtime = 0
+    parts = [
+        config.ai.model_name,
+        config.ai.system_prompt,
+        config.tts.provider,
+        config.tts.piper_model,
+        str(config.tts.xtts_reference_audio),
+        config.tts.xtts_language,
+        str(config.rvc.model_path) if config.rvc.enabled else "",
+        f"{avatar}@{avatar_mtime}",
+    ]
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """A cached response and its media files."""
+    key: str
+    prompt: str
+    response_text: str
+    audio_path: str | None = None
+    video_path: str | None = None
+    context: str = ""
+
+
+class ResponseCache:
+    """Size-bounded (LRU) on-disk cache of responses keyed by prompt."""
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, config: CacheConfig, context: str = ""):
+        """
+        Args:
+            config: Cache configuration
+            context: Fingerprint of the generating settings (see cache_context);
+                entries from a different context are discarded
+        """
+        self.config = config
+        self.context = context
+        self.logger = get_logger("vidchat.cache")
+        self.cache_dir = Path(config.cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._load_index()
+
+        # Semantic tier (embedding model is loaded on first use)
+        self._semantic = config.semantic and SENTENCE_TRANSFORMERS_AVAILABLE
+        if config.semantic and not SENTENCE_TRANSFORMERS_AVAILABLE:
+            self.logger.warning("sentence-transformers not installed, using exact-match cache only")
+        self._model = None
+        self._keys: list[str] = []
+        self._embeddings = None
+        self._index = None
+
+        self.logger.info(f"Response cache: {len(self._entries)} entries in {self.cache_dir}")
+
+    def _load_index(self):
+        """Load entries persisted by a previous run, dropping ones with missing files."""
+        index_path = self.cache_dir / self.INDEX_FILE
+        if not index_path.exists():
+            return
+        try:
+            with open(index_path, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable cache index: {e}")
+            return
+        for data in entries:
+            entry = CacheEntry(**data)
+            stale = entry.context != self.context
+            missing = any(path and not Path(path).exists() for path in (entry.audio_path, entry.video_path))
+            if stale or missing:
+                for path in (entry.audio_path, entry.video_path):
+                    if path:
+                        Path(path).unlink(missing_ok=True)
+                continue
+            self._entries[entry.key] = entry
+
+    def _save_index(self):
+        index_path = self.cache_dir / self.INDEX_FILE
+        tmp_path = index_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump([asdict(e) for e in self._entries.values()], f)
+        tmp_path.replace(index_path)
+
+    def _key(self, normalized: str) -> str:
+        return hashlib.sha256(f"{self.context}\0{normalized}".encode()).hexdigest()
+
+    def _embed(self, texts: list[str]):
+        """Unit-normalized float32 embeddings (so inner product is cosine similarity)."""
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.config.embedding_model)
+        return self._model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype("float32")
+
+    def _rebuild_semantic_index(self):
+        """Re-embed all cached prompts (after loading or eviction)."""
+        self._keys = list(self._entries)
+        if not self._keys:
+            self._embeddings = None
+            self._index = None
+            return
+        self._embeddings = self._embed([self._entries[k].prompt for k in self._keys])
+        if FAISS_AVAILABLE:
+            import faiss
+            self._index = faiss.IndexFlatIP(self._embeddings.shape[1])
+            self._index.add(self._embeddings)
+
+    def _semantic_lookup(self, prompt: str) -> CacheEntry | None:
+        if self._embeddings is None and self._entries:
+            self._rebuild_semantic_index()
+        if self._embeddings is None:
+            return None
+
+        query = self._embed([prompt])
+        if self._index is not None:
+            scores, ids = self._index.search(query, 1)
+            score, idx = float(scores[0][0]), int(ids[0][0])
+        else:
+            sims = self._embeddings @ query[0]
+            idx = int(sims.argmax())
+            score = float(sims[idx])
+
+        if idx < 0 or score < self.config.similarity_threshold:
+            return None
+        self.logger.info(f"Semantic cache hit (cosine {score:.3f})")
+        return self._entries.get(self._keys[idx])
+
+    def get(self, prompt: str) -> CacheEntry | None:
+        """
+        Look up a cached response for a prompt.
+
+        Args:
+            prompt: User prompt
+
+        Returns:
+            Cached entry, or None on a miss
+        """
+        normalized = normalize_prompt(prompt)
+        key = self._key(normalized)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._semantic:
+                entry = self._semantic_lookup(normalized)
+            if entry is not None:
+                self._entries.move_to_end(entry.key)
+            return entry
+
+    def put(
+        self,
+        prompt: str,
+        response_text: str,
+        audio_path: str | None = None,
+        video_path: str | None = None,
+    ) -> CacheEntry:
+        """
+        Cache a response. Media files are copied into the cache directory.
+
+        Args:
+            prompt: User prompt
+            response_text: AI response text
+            audio_path: Generated speech audio
+            video_path: Generated avatar video
+
+        Returns:
+            The stored entry
+        """
+        normalized = normalize_prompt(prompt)
+        key = self._key(normalized)
+
+        def store(src: str | None) -> str | None:
+            if not src:
+                return None
+            dest = self.cache_dir / f"{key}{Path(src).suffix}"
+            shutil.copyfile(src, dest)
+            return str(dest)
+
+        entry = CacheEntry(
+            key=key,
+            prompt=normalized,
+            response_text=response_text,
+            audio_path=store(audio_path),
+            video_path=store(video_path),
+            context=self.context,
+        )
+
+        with self._lock:
+            is_new = key not in self._entries
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            evicted = False
+            while len(self._entries) > self.config.max_entries:
+                _, old = self._entries.popitem(last=False)
+                for path in (old.audio_path, old.video_path):
+                    if path:
+                        Path(path).unlink(missing_ok=True)
+                evicted = True
+
+            if self._semantic and self._embeddings is not None:
+                if evicted:
+                    self._rebuild_semantic_index()
+                elif is_new:
+                    import numpy as np
+
+                    embedding = self._embed([normalized])
+                    self._keys.append(key)
+                    self._embeddings = np.vstack([self._embeddings, embedding])
+                    if self._index is not None:
+                        self._index.add(embedding)
+
+            self._save_index()
+
+        return entry
@@ -4,16 +4,28 @@ This module provides a simple wrapper for MLflow experiment tracking,
 making it easy to log metrics, parameters, and artifacts during training.
 
 Includes system metrics monitoring (GPU/CPU, memory) and model checkpoint logging.
+
+Heavy dependencies (mlflow, psutil, torch, pynvml) are imported lazily so that
+importing this module stays cheap when tracking is never used.
 """
 
-import mlflow
+import json
+import os
+import queue
+import shutil
+import tempfile
 from pathlib import Path
 from typing import Any, Dict, Optional
 from contextlib import contextmanager
 import time
-import psutil
 import threading
 
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
 
 class MLflowTracker:
     """MLflow experiment tracker for RVC voice training with system metrics."""
@@ -43,65 +55,141 @@ class MLflowTracker:
         self._stop_monitoring = threading.Event()
         self._step_counter = 0
 
+        import mlflow
+        self._mlflow = mlflow
+        self._client = None
+        self._run_id = None
+        self._proc = None  # psutil.Process handle for the trainer subprocess
+
+        # The tracker usually runs in the launcher process while RVC trains in a
+        # subprocess, so torch.cuda.memory_* would report this process's (empty)
+        # CUDA context. Only trust them when running inside the trainer itself.
+        self._is_trainer = "TORCHELASTIC_RUN_ID" in os.environ or "LOCAL_RANK" in os.environ
+
         # Set up tracking URI (default to local file store in .data/mlflow)
+        from vidchat.utils.config_loader import get_project_root
+        project_root = get_project_root()
         if tracking_uri is None:
-            from vidchat.utils.config_loader import get_project_root
-            project_root = get_project_root()
             tracking_uri = (project_root / ".data" / "mlruns").as_uri()
 
-        mlflow.set_tracking_uri(tracking_uri)
+        self._mlflow.set_tracking_uri(tracking_uri)
+        self.tracking_uri = tracking_uri
+        self._experiment_cache_file = project_root / ".data" / "mlruns" / ".exp_cache.json"
 
         # Create or get experiment
+        self.experiment_id = self._resolve_experiment_id(experiment_name)
+
+        # Detect GPU availability (NVML outside the trainer to avoid a CUDA context)
+        self.has_gpu = False
+        if self._is_trainer:
+            try:
+                import torch
+                self.has_gpu = torch.cuda.is_available()
+                if self.has_gpu:
+                    self.gpu_name = torch.cuda.get_device_name(0)
+            except ImportError:
+                pass
+        else:
+            try:
+                import pynvml
+                pynvml.nvmlInit()
+                try:
+                    self.has_gpu = pynvml.nvmlDeviceGetCount() > 0
+                    if self.has_gpu:
+                        name = pynvml.nvmlDeviceGetName(pynvml.nvmlDeviceGetHandleByIndex(0))
+                        self.gpu_name = name.decode() if isinstance(name, bytes) else name
+                finally:
+                    pynvml.nvmlShutdown()
+            except Exception:
+                pass
+
+    def _load_experiment_cache(self) -> Dict[str, str]:
+        """Load the on-disk experiment id cache."""
+        try:
+            with open(self._experiment_cache_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _resolve_experiment_id(self, name: str, refresh: bool = False) -> Optional[str]:
+        """Get the experiment id for a name, creating the experiment if needed.
+
+        Ids are cached on disk per tracking URI so repeated tracker creation
+        skips the get_experiment_by_name round-trip.
+
+        Args:
+            name: Experiment name
+            refresh: Ignore any cached id and query the tracking server
+
+        Returns:
+            Experiment id, or None if MLflow could not be reached
+        """
+        cache_key = f"{self.tracking_uri}::{name}"
+        cache = self._load_experiment_cache()
+        if not refresh and cache_key in cache:
+            return cache[cache_key]
+
         try:
-            experiment = mlflow.get_experiment_by_name(experiment_name)
+            experiment = self._mlflow.get_experiment_by_name(name)
             if experiment is None:
-                experiment_id = mlflow.create_experiment(experiment_name)
+                experiment_id = self._mlflow.create_experiment(name)
             else:
                 experiment_id = experiment.experiment_id
-            self.experiment_id = experiment_id
         except Exception as e:
             print(f"Warning: Could not set up MLflow experiment: {e}")
-            self.experiment_id = None
+            return None
 
-        # Detect GPU availability
-        self.has_gpu = False
+        cache[cache_key] = experiment_id
         try:
-            import torch
-            self.has_gpu = torch.cuda.is_available()
-            if self.has_gpu:
-                self.gpu_name = torch.cuda.get_device_name(0)
-        except ImportError:
-            pass
+            self._experiment_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._experiment_cache_file, 'w') as f:
+                json.dump(cache, f, indent=2)
+        except OSError as e:
+            print(f"Warning: Could not write experiment cache: {e}")
+
+        return experiment_id
 
     def _collect_system_metrics(self) -> Dict[str, float]:
         """Collect current system metrics (CPU, memory, GPU)."""
         metrics = {}
 
+        import psutil
+
         # CPU and Memory
         metrics["system/cpu_percent"] = psutil.cpu_percent(interval=1)
         memory = psutil.virtual_memory()
         metrics["system/memory_percent"] = memory.percent
         metrics["system/memory_used_gb"] = memory.used / (1024**3)
 
+        # Trainer subprocess memory (handle is cached by attach_process)
+        if self._proc is not None:
+            try:
+                metrics["system/trainer_rss_gb"] = self._proc.memory_info().rss / (1024**3)
+            except psutil.Error:
+                self._proc = None  # Trainer exited
+
         # GPU metrics if available
         if self.has_gpu:
-            try:
-                import torch
-                if torch.cuda.is_available():
+            if self._is_trainer:
+                try:
+                    import torch
                     metrics["system/gpu_memory_allocated_gb"] = torch.cuda.memory_allocated() / (1024**3)
                     metrics["system/gpu_memory_reserved_gb"] = torch.cuda.memory_reserved() / (1024**3)
-                    # Try to get GPU utilization
-                    try:
-                        import pynvml
-                        pynvml.nvmlInit()
-                        handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-                        util = pynvml.nvmlDeviceGetUtilizationRates(handle)
-                        metrics["system/gpu_utilization_percent"] = util.gpu
-                        pynvml.nvmlShutdown()
-                    except:
-                        pass  # pynvml not available
-            except:
-                pass
+                except Exception:
+                    pass
+            try:
+                import pynvml
+                pynvml.nvmlInit()
+                handle = pynvml.nvmlDeviceGetHandleByIndex(0)
+                util = pynvml.nvmlDeviceGetUtilizationRates(handle)
+                metrics["system/gpu_utilization_percent"] = util.gpu
+                if not self._is_trainer:
+                    # Device-wide usage, which includes the trainer subprocess
+                    mem = pynvml.nvmlDeviceGetMemoryInfo(handle)
+                    metrics["system/gpu_memory_used_gb"] = mem.used / (1024**3)
+                pynvml.nvmlShutdown()
+            except Exception:
+                pass  # pynvml not available
 
         return metrics
 
@@ -118,6 +206,18 @@ class MLflowTracker:
             # Wait for next sample
             self._stop_monitoring.wait(self.monitor_interval)
 
+    def attach_process(self, pid: int):
+        """Track memory of the training subprocess in system metrics.
+
+        Args:
+            pid: Process id of the trainer
+        """
+        try:
+            import psutil
+            self._proc = psutil.Process(pid)
+        except Exception as e:
+            print(f"Warning: Could not attach to process {pid}: {e}")
+
     def start_system_monitoring(self):
         """Start background system metrics monitoring."""
         if self.monitor_system and self._monitoring_thread is None:
@@ -146,10 +246,21 @@ class MLflowTracker:
                 tracker.log_param("learning_rate", 0.001)
                 tracker.log_metric("loss", 0.5, step=1)
         """
-        with mlflow.start_run(
-            experiment_id=self.experiment_id,
-            run_name=self.run_name,
-        ):
+        try:
+            active_run = self._mlflow.start_run(
+                experiment_id=self.experiment_id,
+                run_name=self.run_name,
+            )
+        except self._mlflow.exceptions.MlflowException:
+            # Cached experiment id may be stale (experiment deleted); re-query once
+            self.experiment_id = self._resolve_experiment_id(self.experiment_name, refresh=True)
+            active_run = self._mlflow.start_run(
+                experiment_id=self.experiment_id,
+                run_name=self.run_name,
+            )
+
+        with active_run:
+            self._run_id = active_run.info.run_id
             # Start system monitoring if enabled
             self.start_system_monitoring()
 
@@ -159,51 +270,109 @@ class MLflowTracker:
                 # Stop system monitoring
                 self.stop_system_monitoring()
 
+    def _get_client(self):
+        """Get the shared MlflowClient (reuses its HTTP session across calls)."""
+        if self._client is None:
+            self._client = self._mlflow.tracking.MlflowClient()
+        return self._client
+
+    def _log_batch(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        tags: Optional[Dict[str, Any]] = None,
+        metrics: Optional[Dict[str, float]] = None,
+        step: int = 0,
+    ):
+        """Send params, tags and metrics for the active run in one log_batch request."""
+        from mlflow.entities import Metric, Param, RunTag
+
+        timestamp = int(time.time() * 1000)
+        self._get_client().log_batch(
+            self._run_id,
+            metrics=[Metric(k, float(v), timestamp, step) for k, v in (metrics or {}).items()],
+            params=[Param(k, str(v)) for k, v in (params or {}).items()],
+            tags=[RunTag(k, str(v)) for k, v in (tags or {}).items()],
+        )
+
+    def log_startup(
+        self,
+        params: Dict[str, Any],
+        tags: Dict[str, Any],
+        metrics: Optional[Dict[str, float]] = None,
+    ):
+        """Log run-start params, tags and metrics in a single batch request.
+
+        Args:
+            params: Parameters to log
+            tags: Tags to set
+            metrics: Optional initial metrics (logged at step 0)
+        """
+        try:
+            self._log_batch(params=params, tags=tags, metrics=metrics)
+        except Exception as e:
+            print(f"Warning: Could not log run startup data: {e}")
+
     def log_param(self, key: str, value: Any):
         """Log a parameter."""
         try:
-            mlflow.log_param(key, value)
+            self._mlflow.log_param(key, value)
         except Exception as e:
             print(f"Warning: Could not log parameter {key}: {e}")
 
     def log_params(self, params: Dict[str, Any]):
-        """Log multiple parameters."""
+        """Log multiple parameters in one request."""
         try:
-            mlflow.log_params(params)
+            self._log_batch(params=params)
         except Exception as e:
             print(f"Warning: Could not log parameters: {e}")
 
     def log_metric(self, key: str, value: float, step: Optional[int] = None):
         """Log a metric."""
         try:
-            mlflow.log_metric(key, value, step=step)
+            self._mlflow.log_metric(key, value, step=step)
         except Exception as e:
             print(f"Warning: Could not log metric {key}: {e}")
 
     def log_metrics(self, metrics: Dict[str, float], step: Optional[int] = None):
         """Log multiple metrics."""
         try:
-            mlflow.log_metrics(metrics, step=step)
+            self._mlflow.log_metrics(metrics, step=step)
         except Exception as e:
             print(f"Warning: Could not log metrics: {e}")
 
+    def log_metrics_batch(self, metrics: list):
+        """Log many metrics (possibly across steps) in one request.
+
+        Args:
+            metrics: List of mlflow.entities.Metric
+        """
+        if not metrics:
+            return
+        try:
+            self._get_client().log_batch(self._run_id, metrics=metrics)
+        except Exception as e:
+            print(f"Warning: Could not log metrics batch: {e}")
+
     def log_artifact(self, local_path: str | Path):
         """Log an artifact (file)."""
         try:
-            mlflow.log_artifact(str(local_path))
+            self._mlflow.log_artifact(str(local_path))
         except Exception as e:
             print(f"Warning: Could not log artifact {local_path}: {e}")
 
     def log_artifacts(self, local_dir: str | Path):
         """Log all artifacts in a directory."""
         try:
-            mlflow.log_artifacts(str(local_dir))
+            self._mlflow.log_artifacts(str(local_dir))
         except Exception as e:
             print(f"Warning: Could not log artifacts from {local_dir}: {e}")
 
     def log_model_checkpoint(self, checkpoint_path: str | Path, epoch: int):
         """Log a model checkpoint file.
 
+        When zstandard is installed the checkpoint is streamed through a zstd
+        compressor and uploaded as ``<name>.zst`` to cut artifact upload size.
+
         Args:
             checkpoint_path: Path to the checkpoint file (e.g., G_100.pth)
             epoch: Epoch number for this checkpoint
@@ -211,14 +380,30 @@ class MLflowTracker:
         try:
             checkpoint_path = Path(checkpoint_path)
             if checkpoint_path.exists():
-                # Log the checkpoint file
-                mlflow.log_artifact(str(checkpoint_path), artifact_path=f"checkpoints/epoch_{epoch}")
-                # Log checkpoint metadata
+                artifact_path = f"checkpoints/epoch_{epoch}"
                 file_size_mb = checkpoint_path.stat().st_size / (1024 * 1024)
-                self.log_metrics({
-                    f"checkpoint/epoch_{epoch}_size_mb": file_size_mb,
-                }, step=epoch)
-                print(f"   ✓ Logged checkpoint: {checkpoint_path.name} ({file_size_mb:.1f}MB)")
+                metrics = {f"checkpoint/epoch_{epoch}_size_mb": file_size_mb}
+
+                if ZSTD_AVAILABLE:
+                    # Compress to a temp file, then log the compressed artifact
+                    cctx = zstd.ZstdCompressor(level=3, threads=-1)
+                    with tempfile.TemporaryDirectory() as tmp_dir:
+                        compressed_path = Path(tmp_dir) / f"{checkpoint_path.name}.zst"
+                        with open(checkpoint_path, 'rb') as src, \
+                                open(compressed_path, 'wb') as dst:
+                            with cctx.stream_reader(src) as reader:
+                                shutil.copyfileobj(reader, dst)
+                        compressed_mb = compressed_path.stat().st_size / (1024 * 1024)
+                        self._mlflow.log_artifact(str(compressed_path), artifact_path=artifact_path)
+                    metrics[f"checkpoint/epoch_{epoch}_compressed_size_mb"] = compressed_mb
+                    size_info = f"{file_size_mb:.1f}MB -> {compressed_mb:.1f}MB zstd"
+                else:
+                    self._mlflow.log_artifact(str(checkpoint_path), artifact_path=artifact_path)
+                    size_info = f"{file_size_mb:.1f}MB"
+
+                # Log checkpoint metadata
+                self.log_metrics(metrics, step=epoch)
+                print(f"   ✓ Logged checkpoint: {checkpoint_path.name} ({size_info})")
             else:
                 print(f"   ⚠️  Checkpoint not found: {checkpoint_path}")
         except Exception as e:
@@ -245,35 +430,45 @@ class MLflowTracker:
                         self.log_model_checkpoint(checkpoint, epoch)
                     except (ValueError, IndexError):
                         # If we can't extract epoch, just log the file
-                        mlflow.log_artifact(str(checkpoint), artifact_path="checkpoints")
+                        self._mlflow.log_artifact(str(checkpoint), artifact_path="checkpoints")
                         print(f"   ✓ Logged checkpoint: {checkpoint.name}")
             else:
                 print(f"   No checkpoints found matching '{pattern}' in {checkpoint_dir}")
         except Exception as e:
             print(f"Warning: Could not log checkpoints from {checkpoint_dir}: {e}")
 
+    def artifact_store_is_local(self) -> bool:
+        """Check whether the active run stores artifacts on the local filesystem."""
+        try:
+            uri = self._mlflow.get_artifact_uri()
+        except Exception:
+            return False
+        return uri.startswith("file:") or "://" not in uri
+
     def set_tag(self, key: str, value: Any):
         """Set a tag."""
         try:
-            mlflow.set_tag(key, value)
+            self._mlflow.set_tag(key, value)
         except Exception as e:
             print(f"Warning: Could not set tag {key}: {e}")
 
     def set_tags(self, tags: Dict[str, Any]):
-        """Set multiple tags."""
+        """Set multiple tags in one request."""
         try:
-            mlflow.set_tags(tags)
+            self._log_batch(tags=tags)
         except Exception as e:
             print(f"Warning: Could not set tags: {e}")
 
     @staticmethod
     def get_tracking_uri() -> str:
         """Get the current MLflow tracking URI."""
+        import mlflow
         return mlflow.get_tracking_uri()
 
     @staticmethod
     def get_ui_url() -> str:
         """Get the URL for the MLflow UI."""
+        import mlflow
         uri = mlflow.get_tracking_uri()
         if uri.startswith("file://"):
             # Local file store - UI will be at http://localhost:5000
@@ -281,6 +476,57 @@ class MLflowTracker:
         return uri
 
 
+class AsyncMlflowSink:
+    """Background writer that drains metric batches to MLflow.
+
+    Producers call ``put`` and return immediately; a daemon thread forwards
+    each batch to ``MLflowTracker.log_metrics_batch``. The queue is unbounded
+    (metric batches are small), so a lagging backend delays logging but
+    never stalls training progress or loses metrics.
+    """
+
+    _SENTINEL = object()
+
+    def __init__(self, tracker: MLflowTracker):
+        """Initialize and start the sink.
+
+        Args:
+            tracker: Tracker with an active run
+        """
+        self.tracker = tracker
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._drain_loop, daemon=True)
+        self._thread.start()
+
+    def _drain_loop(self):
+        """Forward queued batches to MLflow until the sentinel arrives."""
+        while True:
+            batch = self._queue.get()
+            if batch is self._SENTINEL:
+                break
+            self.tracker.log_metrics_batch(batch)
+
+    def put(self, batch: list):
+        """Queue a batch of mlflow Metric entities without blocking."""
+        if batch:
+            self._queue.put_nowait(batch)
+
+    def close(self, timeout: float = 30):
+        """Flush pending batches and stop the worker thread.
+
+        Args:
+            timeout: Seconds to wait for the backlog to reach MLflow
+        """
+        # Queued behind every pending batch, so the worker flushes them all first
+        self._queue.put_nowait(self._SENTINEL)
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            print(
+                f"Warning: MLflow logging did not finish within {timeout}s, "
+                f"{self._queue.qsize() - 1} metric batches still queued"
+            )
+
+
 def create_rvc_tracker(
     voice_name: str,
     epochs: int,
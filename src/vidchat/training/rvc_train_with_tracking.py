@@ -8,23 +8,52 @@ import os
 import sys
 import subprocess
 import re
+import shutil
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 import time
 import hashlib
 import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from watchfiles import watch
+    WATCHFILES_AVAILABLE = True
+except ImportError:
+    WATCHFILES_AVAILABLE = False
+
 # Add project root to path
-project_root = Path(__file__).resolve().parents[3]
-sys.path.insert(0, str(project_root))
+_PROJECT_ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(_PROJECT_ROOT))
+
+_NCPU = os.cpu_count() or 4
+
+# RVC requires its own Python 3.10 interpreter
+_RVC_PYTHON = str(Path.home() / ".local/share/mise/installs/python/3.10.19/bin/python3")
 
 try:
-    from vidchat.training.mlflow_tracker import create_rvc_tracker
+    from vidchat.training.mlflow_tracker import AsyncMlflowSink, create_rvc_tracker
     from vidchat.utils.config_loader import load_config
 except ImportError:
     print("Warning: Could not import tracking modules. MLflow tracking disabled.")
     create_rvc_tracker = None
 
+# Training log scanner, e.g. "[epoch 5] loss_disc=1.234, loss_gen=2.345".
+# Group 1 is the epoch; groups 2/3 are a key=value metric pair.
+_LOG_SCANNER = re.compile(r'\[epoch (\d+)\]|(\w+)=([\d.]+)')
+# Metric keys RVC emits; add new loss_* keys here to have them logged
+_ALLOWED_KEYS = frozenset({
+    'loss_disc', 'loss_gen', 'loss_fm', 'loss_mel', 'loss_kl', 'lr', 'grad_norm',
+})
+
 
 def compute_cache_key(wav_files: list, preprocessing_params: dict) -> str:
     """Compute a cache key based on input files and preprocessing parameters.
@@ -102,6 +131,20 @@ def is_cache_valid(exp_dir: Path, cache_key: str) -> bool:
         return False
 
 
+def write_json(path: Path, data: dict):
+    """Write a dict as indented JSON, using orjson when installed.
+
+    Args:
+        path: Output file
+        data: JSON-serializable data
+    """
+    if ORJSON_AVAILABLE:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2) + b"\n")
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
 def save_cache_metadata(exp_dir: Path, cache_key: str, preprocessing_params: dict):
     """Save cache metadata to disk.
 
@@ -118,8 +161,76 @@ def save_cache_metadata(exp_dir: Path, cache_key: str, preprocessing_params: dic
         "preprocessing_params": preprocessing_params,
     }
 
-    with open(cache_file, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    write_json(cache_file, metadata)
+
+
+COPY_MODES = ("symlink", "hardlink", "copy")
+
+
+def stage_file(src: Path, dest: Path, mode: str = "symlink"):
+    """Place a training file in the RVC directory without copying if possible.
+
+    Files are linked individually (not the whole directory) because RVC writes
+    its sliced output into the same 0_gt_wavs directory. Any link failure
+    falls back to a full copy. Existing destinations are left untouched.
+
+    Args:
+        src: Source file
+        dest: Destination path
+        mode: One of "symlink", "hardlink" or "copy"
+    """
+    if dest.exists():
+        return
+    if dest.is_symlink():
+        dest.unlink()  # Dangling link from a moved data directory
+
+    try:
+        if mode == "symlink":
+            os.symlink(src.resolve(), dest)
+            return
+        if mode == "hardlink":
+            os.link(src, dest)
+            return
+    except OSError:
+        pass
+
+    shutil.copy2(src, dest)
+
+
+def run_streaming(cmd: list, cwd: Path, log_path: Path, env: Optional[dict] = None) -> tuple[int, str]:
+    """Run a command, streaming its combined output to a log file line by line.
+
+    Unlike capture_output, memory stays bounded to the last few lines and the
+    log can be followed while the command runs.
+
+    Args:
+        cmd: Command and arguments
+        cwd: Working directory
+        log_path: File to append output to
+        env: Optional environment for the child process
+
+    Returns:
+        Tuple of (return code, last lines of output for error reporting)
+    """
+    tail = deque(maxlen=50)
+    # No preexec_fn and default close_fds: CPython then spawns via vfork/posix_spawn
+    # rather than a full fork, so a launcher holding large imports stays cheap to
+    # fan out from. Keep it that way when adding options here.
+    # Line-buffered append keeps lines whole when several commands share a log
+    with open(log_path, "a", buffering=1) as log, subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=1,
+        text=True,
+    ) as proc:
+        for line in proc.stdout:
+            log.write(line)
+            tail.append(line)
+
+    return proc.returncode, "".join(tail)
 
 
 def parse_log_metrics(log_line: str) -> Optional[dict]:
@@ -128,42 +239,100 @@ def parse_log_metrics(log_line: str) -> Optional[dict]:
     Example log format:
     INFO:experiment:[epoch 5] loss_disc=1.234, loss_gen=2.345, loss_fm=3.456, loss_mel=4.567
     """
-    # Pattern to match epoch and metrics
-    epoch_match = re.search(r'\[epoch (\d+)\]', log_line)
-    if not epoch_match:
-        return None
-
-    epoch = int(epoch_match.group(1))
+    # Single pass over the line for both the epoch tag and loss_* = value pairs
+    epoch = None
     metrics = {}
-
-    # Extract all metrics (loss_* = value)
-    metric_pattern = r'(\w+)=([\d.]+)'
-    for match in re.finditer(metric_pattern, log_line):
-        key, value = match.groups()
-        if key.startswith('loss_') or key in ['lr', 'grad_norm']:
+    for match in _LOG_SCANNER.finditer(log_line):
+        epoch_str, key, value = match.groups()
+        if epoch_str is not None:
+            if epoch is None:
+                epoch = int(epoch_str)
+        elif key in _ALLOWED_KEYS:
             metrics[key] = float(value)
 
+    if epoch is None:
+        return None
+
     if metrics:
         return {'epoch': epoch, 'metrics': metrics}
     return None
 
 
-def tail_and_log_metrics(
-    log_file: Path,
-    tracker,
-    stop_event=None,
-):
-    """Tail log file and log metrics to MLflow in real-time.
+def read_complete_lines(f) -> Iterator[str]:
+    """Yield lines appended to an open log since the last read, one at a time.
+
+    A trailing partial line (still being written) is left unread so it is
+    picked up whole on the next call.
 
     Args:
-        log_file: Path to training log file
-        tracker: MLflowTracker instance
-        stop_event: Optional threading.Event to signal stop
+        f: Text file handle positioned at the last read offset
     """
-    print(f"📊 Monitoring training log: {log_file}")
+    while True:
+        position = f.tell()
+        line = f.readline()
+        if not line:
+            return
+        if not line.endswith("\n"):
+            f.seek(position)
+            return
+        yield line
+
+
+def parse_metric_lines(lines: Iterable[str]) -> list:
+    """Parse training log lines into a batch of MLflow metrics.
+
+    Args:
+        lines: Raw log lines (consumed incrementally)
+
+    Returns:
+        List of mlflow.entities.Metric for every metric found
+    """
+    from mlflow.entities import Metric
+
+    batch = []
+    timestamp = int(time.time() * 1000)
+    for line in lines:
+        parsed = parse_log_metrics(line)
+        if parsed:
+            epoch = parsed['epoch']
+            metrics = parsed['metrics']
+            batch.extend(Metric(key, value, timestamp, epoch) for key, value in metrics.items())
+            print(f"  Epoch {epoch}: {metrics}")
+
+    return batch
 
+
+def _stop_requested(stop_event) -> bool:
+    """Check an optional threading.Event."""
+    return stop_event is not None and stop_event.is_set()
+
+
+def _watch_log(log_file: Path, sink, stop_event=None):
+    """Read new log lines whenever watchfiles reports the log changed."""
+    while not log_file.exists():
+        if _stop_requested(stop_event):
+            return
+        time.sleep(1)
+
+    with open(log_file, 'r') as f:
+        sink.put(parse_metric_lines(read_complete_lines(f)))
+        # rust_timeout + yield_on_timeout gives a 10s safety re-read
+        # in case an event is missed; otherwise we only wake on writes.
+        for changes in watch(
+            log_file.parent,
+            stop_event=stop_event,
+            rust_timeout=10000,
+            yield_on_timeout=True,
+        ):
+            if not changes or any(Path(path).name == log_file.name for _, path in changes):
+                sink.put(parse_metric_lines(read_complete_lines(f)))
+        sink.put(parse_metric_lines(read_complete_lines(f)))  # Drain after stop
+
+
+def _poll_log(log_file: Path, sink, stop_event=None):
+    """Read new log lines every 2 seconds (fallback without watchfiles)."""
     last_position = 0
-    while stop_event is None or not stop_event.is_set():
+    while not _stop_requested(stop_event):
         if not log_file.exists():
             time.sleep(1)
             continue
@@ -171,30 +340,52 @@ def tail_and_log_metrics(
         try:
             with open(log_file, 'r') as f:
                 f.seek(last_position)
-                lines = f.readlines()
+                sink.put(parse_metric_lines(read_complete_lines(f)))
                 last_position = f.tell()
-
-                for line in lines:
-                    # Parse and log metrics
-                    parsed = parse_log_metrics(line)
-                    if parsed:
-                        epoch = parsed['epoch']
-                        metrics = parsed['metrics']
-                        tracker.log_metrics(metrics, step=epoch)
-                        print(f"  Epoch {epoch}: {metrics}")
-
         except Exception as e:
             print(f"Warning: Error reading log: {e}")
 
         time.sleep(2)  # Poll every 2 seconds
 
 
+def tail_and_log_metrics(
+    log_file: Path,
+    tracker,
+    stop_event=None,
+):
+    """Tail log file and log metrics to MLflow in real-time.
+
+    Holds a single handle on the log and uses filesystem notifications
+    (watchfiles) to wake only when it changes, falling back to polling
+    when watchfiles is not installed. Metrics are handed to an
+    AsyncMlflowSink so a slow tracking backend never stalls the tail.
+
+    Args:
+        log_file: Path to training log file
+        tracker: MLflowTracker instance
+        stop_event: Optional threading.Event to signal stop
+    """
+    print(f"📊 Monitoring training log: {log_file}")
+
+    sink = AsyncMlflowSink(tracker)
+    try:
+        if WATCHFILES_AVAILABLE:
+            _watch_log(log_file, sink, stop_event)
+        else:
+            _poll_log(log_file, sink, stop_event)
+    except Exception as e:
+        print(f"Warning: Error reading log: {e}")
+    finally:
+        sink.close()
+
+
 def train_rvc_with_tracking(
     experiment_name: str,
     epochs: int = 300,
     batch_size: int = 4,
     save_freq: int = 10,
     gpu: bool = False,
+    copy_mode: str = "symlink",
 ):
     """Train RVC model with MLflow tracking.
 
@@ -204,17 +395,16 @@ def train_rvc_with_tracking(
         batch_size: Batch size for training
         save_freq: Save checkpoint every N epochs
         gpu: Use GPU if available
+        copy_mode: How training wavs are staged for RVC ("symlink", "hardlink" or "copy")
     """
     # Use RVC from project's external directory
-    project_root = Path(__file__).resolve().parents[3]
-    rvc_dir = project_root / "external" / "RVC"
+    rvc_dir = _PROJECT_ROOT / "external" / "RVC"
 
     exp_dir = rvc_dir / "logs" / experiment_name
     log_file = exp_dir / "train.log"
 
     # Check if training data exists in VidChat's data directory
-    project_root = Path(__file__).resolve().parents[3]
-    vidchat_data_dir = project_root / ".data" / "voice_data" / experiment_name
+    vidchat_data_dir = _PROJECT_ROOT / ".data" / "voice_data" / experiment_name
 
     if not vidchat_data_dir.exists() or not list(vidchat_data_dir.glob("*.wav")):
         print(f"❌ Training data not found: {vidchat_data_dir}")
@@ -226,18 +416,18 @@ def train_rvc_with_tracking(
     gt_wavs_dir = exp_dir / "0_gt_wavs"
     gt_wavs_dir.mkdir(exist_ok=True)
 
-    # Copy prepared audio files to RVC directory
-    print(f"\n📂 Copying audio files to RVC directory...")
+    # Stage prepared audio files in RVC directory
+    print(f"\n📂 Staging audio files in RVC directory ({copy_mode})...")
     wav_files = list(vidchat_data_dir.glob("*.wav"))
     print(f"   Found {len(wav_files)} audio files")
 
-    import shutil
-    for wav_file in wav_files:
-        dest = gt_wavs_dir / wav_file.name
-        if not dest.exists():
-            shutil.copy2(wav_file, dest)
+    with ThreadPoolExecutor(max_workers=min(32, _NCPU * 4)) as executor:
+        list(executor.map(
+            lambda wav_file: stage_file(wav_file, gt_wavs_dir / wav_file.name, copy_mode),
+            wav_files,
+        ))
 
-    print(f"   ✓ Copied to: {gt_wavs_dir}")
+    print(f"   ✓ Staged in: {gt_wavs_dir}")
 
     # Define preprocessing parameters for cache key
     preprocessing_params = {
@@ -262,48 +452,46 @@ def train_rvc_with_tracking(
         if exp_dir.exists() and (exp_dir / "cache_metadata.json").exists():
             print(f"   Cache invalidated (data or parameters changed)")
 
-        python_cmd = str(Path.home() / ".local/share/mise/installs/python/3.10.19/bin/python3")
+        # Output of all preprocessing steps is streamed here
+        preprocess_log = exp_dir / "preprocess.log"
+        preprocess_log.write_text("")
+        print(f"   📝 Logging to: {preprocess_log}")
 
         # Step 1: Preprocess audio (resample and slice)
         print("   1/5 Preprocessing audio...")
         preprocess_cmd = [
-            python_cmd,
+            _RVC_PYTHON,
             str(rvc_dir / "infer/modules/train/preprocess.py"),
             str(gt_wavs_dir),
             "40000",  # Sample rate
-            str(os.cpu_count() or 4),  # Number of CPU cores
+            str(_NCPU),  # Number of CPU cores
             str(exp_dir),
             "False",  # noparallel
             "3.7",  # Segment length
         ]
 
-        result = subprocess.run(preprocess_cmd, cwd=rvc_dir, capture_output=True, text=True)
-        if result.returncode != 0:
+        returncode, output = run_streaming(preprocess_cmd, rvc_dir, preprocess_log)
+        if returncode != 0:
             print(f"   ❌ Preprocessing failed:")
-            print(result.stderr)
+            print(output)
             return
         print(f"   ✓ Preprocessing complete")
 
-        # Step 2: Extract pitch (f0)
+        # Steps 2 and 3 both only read the sliced 16k wavs from step 1, so they
+        # run concurrently. Feature extraction uses a single process; f0 gets
+        # the remaining cores to avoid oversubscription.
         print("   2/5 Extracting pitch (f0)...")
         f0_extract_cmd = [
-            python_cmd,
+            _RVC_PYTHON,
             str(rvc_dir / "infer/modules/train/extract/extract_f0_print.py"),
             str(exp_dir),
-            str(os.cpu_count() or 4),  # Number of processes
+            str(max(1, _NCPU - 1)),  # Number of processes
             "rmvpe",  # F0 extraction method (rmvpe is most accurate)
         ]
 
-        result = subprocess.run(f0_extract_cmd, cwd=rvc_dir, capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"   ❌ Pitch extraction failed:")
-            print(result.stderr)
-            return
-        print(f"   ✓ Pitch extraction complete")
-
         # Step 3: Extract features (using patched wrapper for PyTorch 2.6 compatibility)
         print("   3/5 Extracting features...")
-        patched_extract_script = project_root / "src" / "vidchat" / "training" / "extract_features_patched.py"
+        patched_extract_script = _PROJECT_ROOT / "src" / "vidchat" / "training" / "extract_features_patched.py"
 
         # Use GPU for feature extraction if available
         device = "cuda" if gpu else "cpu"
@@ -311,7 +499,7 @@ def train_rvc_with_tracking(
         n_processes = "1"  # Use 1 GPU process for feature extraction
 
         extract_cmd = [
-            python_cmd,
+            _RVC_PYTHON,
             str(patched_extract_script),
             device,  # Device (cuda or cpu)
             n_processes,  # Number of processes
@@ -326,39 +514,44 @@ def train_rvc_with_tracking(
         if not gpu:
             env["CUDA_VISIBLE_DEVICES"] = ""
 
-        result = subprocess.run(extract_cmd, cwd=rvc_dir, capture_output=True, text=True, env=env)
-        if result.returncode != 0:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            f0_future = executor.submit(run_streaming, f0_extract_cmd, rvc_dir, preprocess_log)
+            feature_future = executor.submit(run_streaming, extract_cmd, rvc_dir, preprocess_log, env=env)
+            f0_returncode, f0_output = f0_future.result()
+            feature_returncode, feature_output = feature_future.result()
+
+        failed = False
+        if f0_returncode != 0:
+            print(f"   ❌ Pitch extraction failed:")
+            print(f0_output)
+            failed = True
+        if feature_returncode != 0:
             print(f"   ❌ Feature extraction failed:")
-            print(result.stderr)
+            print(feature_output)
+            failed = True
+        if failed:
             return
-        print(f"   ✓ Feature extraction complete")
+        print(f"   ✓ Pitch and feature extraction complete")
 
         # Step 4: Create filelist.txt
         print("   4/5 Creating filelist...")
         filelist_path = exp_dir / "filelist.txt"
         gt_wavs_dir = exp_dir / "0_gt_wavs"
-        f0_dir = exp_dir / "2a_f0"
-        f0nsf_dir = exp_dir / "2b-f0nsf"
-        feature_dir = exp_dir / "3_feature768"
-
-        with open(filelist_path, "w", encoding="utf-8") as f:
-            # List all processed audio files with their pitch and feature files
-            # Format: gt_wav|feature|f0|f0nsf|speaker_id
-            # Note: RVC expects features before pitch data!
-            processed_wav_files = sorted(gt_wavs_dir.glob("*.wav"))
-            for wav_file in processed_wav_files:
-                base_name = wav_file.stem  # filename without extension
-                f0_file = f0_dir / f"{base_name}.wav.npy"
-                f0nsf_file = f0nsf_dir / f"{base_name}.wav.npy"
-                feature_file = feature_dir / f"{base_name}.npy"
-
-                # Use relative paths from RVC directory
-                rel_gt = f"logs/{experiment_name}/0_gt_wavs/{wav_file.name}"
-                rel_f0 = f"logs/{experiment_name}/2a_f0/{base_name}.wav.npy"
-                rel_f0nsf = f"logs/{experiment_name}/2b-f0nsf/{base_name}.wav.npy"
-                rel_feature = f"logs/{experiment_name}/3_feature768/{base_name}.npy"
-
-                f.write(f"{rel_gt}|{rel_feature}|{rel_f0}|{rel_f0nsf}|0\n")
+
+        # List all processed audio files with their pitch and feature files
+        # Format: gt_wav|feature|f0|f0nsf|speaker_id (paths relative to RVC dir)
+        # Note: RVC expects features before pitch data!
+        processed_wav_files = sorted(gt_wavs_dir.glob("*.wav"))
+        prefix = f"logs/{experiment_name}"
+        lines = [
+            f"{prefix}/0_gt_wavs/{wav_file.name}"
+            f"|{prefix}/3_feature768/{wav_file.stem}.npy"
+            f"|{prefix}/2a_f0/{wav_file.stem}.wav.npy"
+            f"|{prefix}/2b-f0nsf/{wav_file.stem}.wav.npy"
+            f"|0\n"
+            for wav_file in processed_wav_files
+        ]
+        filelist_path.write_text("".join(lines), encoding="utf-8")
 
         print(f"   ✓ Created filelist with {len(processed_wav_files)} files")
 
@@ -415,8 +608,7 @@ def train_rvc_with_tracking(
         }
 
         config_file = exp_dir / "config.json"
-        with open(config_file, "w") as f:
-            json.dump(config_data, f, indent=2)
+        write_json(config_file, config_data)
         print(f"   ✓ Config created: {config_file}")
         print(f"   ✓ RVC preprocessing finished!")
 
@@ -425,18 +617,20 @@ def train_rvc_with_tracking(
         print(f"   💾 Saved preprocessing cache\n")
 
     # Create MLflow tracker
+    tracker = None
     if create_rvc_tracker:
-        tracker = create_rvc_tracker(experiment_name, epochs, batch_size)
-    else:
-        tracker = None
+        try:
+            tracker = create_rvc_tracker(experiment_name, epochs, batch_size)
+        except ImportError as e:
+            print(f"Warning: MLflow not available ({e})")
+    if tracker is None:
         print("⚠️  MLflow tracking disabled")
 
     # Set up training command
-    python_cmd = str(Path.home() / ".local/share/mise/installs/python/3.10.19/bin/python3")
     train_script = rvc_dir / "infer/modules/train/train.py"
 
     cmd = [
-        python_cmd,
+        _RVC_PYTHON,
         str(train_script),
         "-e", experiment_name,
         "-sr", "40k",
@@ -472,24 +666,27 @@ def train_rvc_with_tracking(
 
     # Start MLflow run
     if tracker:
+        # MLflowTracker already samples system metrics; don't let MLflow duplicate them
+        os.environ.setdefault("MLFLOW_ENABLE_SYSTEM_METRICS_LOGGING", "false")
+
         with tracker.start_run():
-            # Log parameters
-            tracker.log_params({
-                "voice_name": experiment_name,
-                "epochs": epochs,
-                "batch_size": batch_size,
-                "save_frequency": save_freq,
-                "sample_rate": "40k",
-                "use_f0": True,
-                "mode": "GPU" if gpu else "CPU",
-            })
-
-            # Log tags
-            tracker.set_tags({
-                "model_type": "RVC",
-                "version": "v2",
-                "training_script": "rvc_train_with_tracking.py",
-            })
+            # Log parameters and tags in one round trip
+            tracker.log_startup(
+                params={
+                    "voice_name": experiment_name,
+                    "epochs": epochs,
+                    "batch_size": batch_size,
+                    "save_frequency": save_freq,
+                    "sample_rate": "40k",
+                    "use_f0": True,
+                    "mode": "GPU" if gpu else "CPU",
+                },
+                tags={
+                    "model_type": "RVC",
+                    "version": "v2",
+                    "training_script": "rvc_train_with_tracking.py",
+                },
+            )
 
             print(f"\n📊 MLflow tracking enabled")
             print(f"   Tracking URI: {tracker.get_tracking_uri()}")
@@ -507,13 +704,13 @@ def train_rvc_with_tracking(
                     env=env,
                 )
 
+            tracker.attach_process(process.pid)
             print(f"✓ Training started (PID: {process.pid})")
             print(f"📝 Logging to: {log_file}")
             print("\nMonitoring metrics (press Ctrl+C to stop monitoring, training continues)...")
 
             # Monitor and log metrics
             try:
-                import threading
                 stop_event = threading.Event()
 
                 monitor_thread = threading.Thread(
@@ -526,7 +723,7 @@ def train_rvc_with_tracking(
                 # Wait for process to complete or user interrupt
                 process.wait()
                 stop_event.set()
-                monitor_thread.join(timeout=5)
+                monitor_thread.join(timeout=35)  # Allow the metric sink to drain
 
             except KeyboardInterrupt:
                 print("\n⚠️  Monitoring stopped (training continues in background)")
@@ -534,9 +731,16 @@ def train_rvc_with_tracking(
             # Log final artifacts
             print("\n📦 Logging artifacts...")
             if exp_dir.exists():
-                # Log all model checkpoints (Generator and Discriminator)
-                tracker.log_model_checkpoints(exp_dir, pattern="G_*.pth")  # Generator checkpoints
-                tracker.log_model_checkpoints(exp_dir, pattern="D_*.pth")  # Discriminator checkpoints
+                # Record where checkpoints live; only copy them into a local
+                # artifact store, since uploading multi-GB .pth files to a
+                # remote server dominates end-of-run time.
+                tracker.log_param("checkpoint_uri", exp_dir.as_uri())
+                if tracker.artifact_store_is_local():
+                    # Log all model checkpoints (Generator and Discriminator)
+                    tracker.log_model_checkpoints(exp_dir, pattern="G_*.pth")  # Generator checkpoints
+                    tracker.log_model_checkpoints(exp_dir, pattern="D_*.pth")  # Discriminator checkpoints
+                else:
+                    print(f"   Skipping checkpoint upload to remote store (see checkpoint_uri)")
 
                 # Log config
                 config_file = exp_dir / "config.json"
@@ -568,6 +772,7 @@ if __name__ == "__main__":
     parser.add_argument("--batch-size", "-b", type=int, default=4, help="Batch size")
     parser.add_argument("--save-freq", "-s", type=int, default=10, help="Save frequency (epochs)")
     parser.add_argument("--gpu", "-g", action="store_true", help="Use GPU if available")
+    parser.add_argument("--copy-mode", choices=COPY_MODES, default="symlink", help="How training wavs are staged for RVC")
 
     args = parser.parse_args()
 
@@ -577,4 +782,5 @@ if __name__ == "__main__":
         batch_size=args.batch_size,
         save_freq=args.save_freq,
         gpu=args.gpu,
+        copy_mode=args.copy_mode,
     )
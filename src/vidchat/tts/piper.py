@@ -1,13 +1,30 @@
 """
 Piper TTS engine implementation.
 """
+import functools
+import json
+import os
+import selectors
 import subprocess
 import tempfile
+import threading
+import time
 from pathlib import Path
 from .base import BaseTTS
 from ..config import TTSConfig
 
 
+@functools.cache
+def _supports_json_input() -> bool:
+    """Whether the installed piper accepts the flags persistent mode needs (probed once)."""
+    try:
+        result = subprocess.run(["piper", "--help"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    usage = result.stdout + result.stderr
+    return "--json-input" in usage and "--output_dir" in usage
+
+
 class PiperTTS(BaseTTS):
     """Piper TTS engine for high-quality speech synthesis."""
 
@@ -21,6 +38,13 @@ class PiperTTS(BaseTTS):
         from ..config import default_config
         self.config = config or default_config.tts
         self.model_path = Path(self.config.piper_model)
+        self._available: bool | None = None  # Cached result of the piper probe
+        self.execution_provider = self._select_provider(self.config.device)
+
+        # Long-lived piper process fed JSON lines, so the model loads once
+        self._persistent = self.config.piper_persistent
+        self._proc: subprocess.Popen | None = None
+        self._lock = threading.Lock()
 
     def synthesize(self, text: str, output_path: str | Path) -> str:
         """
@@ -35,11 +59,15 @@ class PiperTTS(BaseTTS):
         """
         output_path = Path(output_path)
 
-        cmd = [
-            "piper",
-            "--model", str(self.model_path),
-            "--output_file", str(output_path)
-        ]
+        if self._persistent and _supports_json_input():
+            try:
+                return self._synthesize_persistent(text, output_path)
+            except (OSError, RuntimeError):
+                # The process died or stopped responding: use one-shot mode
+                self.close()
+                self._persistent = False
+
+        cmd = self._base_cmd() + ["--output_file", str(output_path)]
 
         result = subprocess.run(
             cmd,
@@ -56,22 +84,126 @@ class PiperTTS(BaseTTS):
 
         return str(output_path)
 
+    @staticmethod
+    def _select_provider(device: str) -> str:
+        """Pick the onnxruntime execution provider piper should use."""
+        if device == "cpu":
+            return "CPUExecutionProvider"
+        try:
+            import onnxruntime
+            providers = onnxruntime.get_available_providers()
+        except ImportError:
+            providers = []
+        if "CUDAExecutionProvider" in providers:
+            return "CUDAExecutionProvider"
+        if device == "cuda":
+            print("Warning: onnxruntime-gpu with CUDA not available, Piper will run on CPU")
+        return "CPUExecutionProvider"
+
+    def _base_cmd(self) -> list[str]:
+        """Piper command line shared by all synthesis modes."""
+        cmd = ["piper", "--model", str(self.model_path)]
+        if self.execution_provider == "CUDAExecutionProvider":
+            cmd.append("--cuda")
+        return cmd
+
+    def _get_process(self) -> subprocess.Popen:
+        """Start the persistent piper process if it is not running."""
+        if self._proc is None or self._proc.poll() is not None:
+            # Own session so a Ctrl+C aimed at the server doesn't kill piper
+            # mid-request; close() handles shutdown. No preexec_fn, so CPython
+            # still uses its vfork fast path.
+            self._proc = subprocess.Popen(
+                self._base_cmd() + [
+                    "--output_dir", tempfile.gettempdir(),
+                    "--json-input",
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+                start_new_session=True,
+            )
+        return self._proc
+
+    def _synthesize_persistent(self, text: str, output_path: Path) -> str:
+        """Synthesize through the persistent piper process.
+
+        Piper prints the path of each written file on stdout, which is used
+        as the completion acknowledgement.
+        """
+        with self._lock:
+            proc = self._get_process()
+            proc.stdin.write(json.dumps({"text": text, "output_file": str(output_path)}) + "\n")
+            proc.stdin.flush()
+            ack = self._read_ack(proc)
+
+        if not ack:
+            raise RuntimeError("Piper process exited unexpectedly")
+
+        if not output_path.exists():
+            raise RuntimeError(f"Piper TTS did not create output file: {output_path}")
+
+        return str(output_path)
+
+    def _read_ack(self, proc: subprocess.Popen) -> bytes:
+        """Read piper's acknowledgement line, killing the process if it takes too long.
+
+        Reads the pipe directly (not proc.stdout's buffer) so select() sees
+        every pending byte.
+        """
+        timeout = self.config.piper_timeout
+        deadline = time.monotonic() + timeout
+        fd = proc.stdout.fileno()
+        line = b""
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while not line.endswith(b"\n"):
+                if not selector.select(max(deadline - time.monotonic(), 0)):
+                    proc.kill()
+                    proc.wait()
+                    raise RuntimeError(f"Piper process did not respond within {timeout}s")
+                chunk = os.read(fd, 4096)
+                if not chunk:
+                    break
+                line += chunk
+        return line
+
+    def close(self):
+        """Stop the persistent piper process, if any."""
+        proc, self._proc = self._proc, None
+        if proc is not None and proc.poll() is None:
+            proc.stdin.close()
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    def __del__(self):
+        # Don't wait during garbage collection or interpreter shutdown
+        proc = getattr(self, "_proc", None)
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+
     def get_sample_rate(self) -> int:
         """Get the sample rate of generated audio."""
         return self.config.sample_rate
 
     def is_available(self) -> bool:
-        """Check if Piper TTS is available."""
-        try:
-            result = subprocess.run(
-                ["piper", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            return False
+        """Check if Piper TTS is available (probed once per instance)."""
+        if self._available is None:
+            try:
+                result = subprocess.run(
+                    ["piper", "--version"],
+                    capture_output=True,
+                    text=True,
+                    timeout=5
+                )
+                self._available = result.returncode == 0
+            except (FileNotFoundError, subprocess.TimeoutExpired):
+                self._available = False
+        return self._available
 
     def list_available_voices(self) -> list[str]:
         """
@@ -28,6 +28,11 @@ class RVCTTS:
         """
         from ..config import default_config
         self.config = config or default_config.rvc
+        self._available: bool | None = None  # Cached by is_available(), cleared by reload()
+
+    def reload(self):
+        """Re-check the model on the next is_available() call (e.g. after training)."""
+        self._available = None
 
     def convert_voice(self, input_audio: str | Path, output_path: str | Path) -> str:
         """
@@ -49,13 +54,13 @@ class RVCTTS:
 
     def is_available(self) -> bool:
         """Check if RVC model is available."""
-        if not self.config.enabled:
-            return False
-
-        if self.config.model_path is None:
-            return False
-
-        return Path(self.config.model_path).exists()
+        if self._available is None:
+            self._available = (
+                self.config.enabled
+                and self.config.model_path is not None
+                and Path(self.config.model_path).exists()
+            )
+        return self._available
 
 
 class HybridTTS(BaseTTS):
@@ -89,18 +94,15 @@ class HybridTTS(BaseTTS):
         """
         # Generate base audio with Piper
         if self.rvc and self.rvc.is_available():
-            # Use temporary file for base audio
+            # Base audio goes to a temporary file (in RAM when /dev/shm exists),
+            # removed even if synthesis or conversion fails
             import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp:
-                base_audio = self.base_tts.synthesize(text, tmp.name)
-
-            # Convert voice with RVC
-            final_audio = self.rvc.convert_voice(base_audio, output_path)
-
-            # Clean up temporary file
-            Path(base_audio).unlink(missing_ok=True)
+            scratch_dir = "/dev/shm" if Path("/dev/shm").is_dir() else None
+            with tempfile.TemporaryDirectory(dir=scratch_dir) as tmp_dir:
+                base_audio = self.base_tts.synthesize(text, Path(tmp_dir) / "base.wav")
 
-            return final_audio
+                # Convert voice with RVC
+                return self.rvc.convert_voice(base_audio, output_path)
         else:
             # Use base TTS only
             return self.base_tts.synthesize(text, output_path)
@@ -4,27 +4,306 @@ Coqui XTTS v2 provides high-quality voice cloning with just 6 seconds of referen
 Supports 17 languages and zero-shot voice cloning (no training needed).
 """
 
+import contextlib
+import functools
+import importlib.util
+import logging
 import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, Literal, Optional
 
-try:
+from vidchat.tts.base import BaseTTS
+from vidchat.tts.xtts_daemon import DEFAULT_SOCKET_PATH, is_running, request_synthesis
+
+if TYPE_CHECKING:
+    import numpy as np
     from TTS.api import TTS
-    XTTS_AVAILABLE = True
-except ImportError:
-    XTTS_AVAILABLE = False
 
-from vidchat.tts.base import BaseTTS
+logger = logging.getLogger(__name__)
+
+XTTS_MODEL_NAME = "tts_models/multilingual/multi-dataset/xtts_v2"
+
+
+@functools.cache
+def _xtts_available() -> bool:
+    """Check whether coqui-tts is installed without importing it (torch is slow to import)."""
+    try:
+        return importlib.util.find_spec("TTS.api") is not None
+    except ModuleNotFoundError:
+        return False
+
+
+def _cache_tokenizer(tokenizer, maxsize: int = 1024):
+    """Memoize tokenizer.encode per (sentence, language).
+
+    XTTS re-runs text cleaning and BPE on every sentence it synthesizes; repeated
+    phrases (greetings, prompts) now skip that work.
+    """
+    encode = functools.lru_cache(maxsize=maxsize)(
+        lambda txt, lang: tuple(type(tokenizer).encode(tokenizer, txt, lang))
+    )
+
+    def cached_encode(txt, lang):
+        # Callers wrap the ids in a tensor; hand each one its own list
+        return list(encode(txt, lang))
+
+    tokenizer.encode = cached_encode
+
+
+def _swap_linear_int8(module):
+    """Replace linear layers under module with bitsandbytes int8 layers (on CUDA)."""
+    import bitsandbytes as bnb
+    import torch
+
+    try:
+        # GPT-2 blocks use Conv1D, a linear layer with a transposed (in, out) weight
+        from transformers.pytorch_utils import Conv1D
+        linear_types = (torch.nn.Linear, Conv1D)
+    except ImportError:
+        linear_types = (torch.nn.Linear,)
+
+    for name, child in list(module.named_children()):
+        if not isinstance(child, linear_types):
+            _swap_linear_int8(child)
+            continue
+        weight = child.weight.data
+        if not isinstance(child, torch.nn.Linear):
+            weight = weight.t()
+        out_features, in_features = weight.shape
+        layer = bnb.nn.Linear8bitLt(
+            in_features, out_features, bias=child.bias is not None,
+            has_fp16_weights=False, threshold=6.0,
+        )
+        layer.weight = bnb.nn.Int8Params(
+            weight.half().contiguous().cpu(), requires_grad=False, has_fp16_weights=False
+        )
+        if child.bias is not None:
+            layer.bias = torch.nn.Parameter(child.bias.data.half().cpu(), requires_grad=False)
+        # Weights are quantized when moved to the GPU
+        setattr(module, name, layer.cuda())
+
+
+class _BucketedDecodeStep:
+    """Single-token GPT-2 decode step replayed from CUDA graphs at fixed cache lengths.
+
+    The KV cache grows by one token per step, so capturing the step as-is
+    would record a new graph for every length. Instead the past keys/values
+    are copied into static buffers padded to the next bucket length (padding
+    masked out of attention) and the step is compiled once per bucket with
+    torch.compile "reduce-overhead". Anything else (prompt prefill, batches,
+    caches longer than the largest bucket) runs the eager forward. Position
+    ids are not passed on: XTTS adds its own position embeddings to
+    inputs_embeds and GPT-2's are disabled.
+    """
+
+    # Past lengths (cache tokens before the new one) a graph is captured for
+    BUCKETS = (64, 128, 256, 512)
+
+    # Transformer kwargs that don't change what the graphed step computes
+    _PASSTHROUGH = ("position_ids", "cache_position", "use_cache", "return_dict", "output_hidden_states")
+
+    def __init__(self, transformer):
+        import torch
+
+        self.transformer = transformer
+        self.eager_forward = transformer.forward
+        self.disabled = False
+        # (bucket, kv dtype, mask dtype) -> (keys, values, mask, cache_position, owner, filled)
+        self._buffers: dict[tuple, list] = {}
+        # Dtypes and flags of the last graphed call, replayed by warm_up()
+        self._template: Optional[tuple] = None
+        # One graph per bucket and output_hidden_states value
+        torch._dynamo.config.cache_size_limit = max(
+            torch._dynamo.config.cache_size_limit, 2 * len(self.BUCKETS)
+        )
+        self._compiled = torch.compile(self._padded_step, mode="reduce-overhead", dynamic=False)
+
+    def install(self):
+        """Route the transformer's forward through this step."""
+        self.transformer.forward = self
+
+    def uninstall(self):
+        """Restore the eager forward."""
+        self.disabled = True
+        self.transformer.forward = self.eager_forward
+
+    def _padded_step(self, inputs_embeds, keys, values, attention_mask, cache_position, output_hidden_states):
+        """Run the transformer on padded static inputs; returns the new token's state only."""
+        past = tuple(zip(keys, values))
+        try:
+            from transformers.cache_utils import DynamicCache
+            past = DynamicCache.from_legacy_cache(past)
+        except ImportError:
+            pass
+        out = self.eager_forward(
+            inputs_embeds=inputs_embeds,
+            past_key_values=past,
+            attention_mask=attention_mask,
+            cache_position=cache_position,
+            use_cache=True,
+            output_hidden_states=output_hidden_states,
+            return_dict=True,
+        )
+        present = out.past_key_values
+        if hasattr(present, "to_legacy_cache"):
+            present = present.to_legacy_cache()
+        bucket = keys[0].shape[-2]
+        new_keys = tuple(k[..., bucket:, :] for k, _ in present)
+        new_values = tuple(v[..., bucket:, :] for _, v in present)
+        return out.last_hidden_state, new_keys, new_values, out.hidden_states
+
+    def _bucket(self, inputs_embeds, past_key_values, attention_mask, args, kwargs) -> Optional[int]:
+        """Bucket length for a graphable decode step, or None to run eagerly."""
+        if self.disabled or args or past_key_values is None or attention_mask is None:
+            return None
+        if inputs_embeds is None or inputs_embeds.shape[:2] != (1, 1):
+            return None
+        if any(
+            value is not None and value is not False
+            for name, value in kwargs.items() if name not in self._PASSTHROUGH
+        ):
+            return None
+        if hasattr(past_key_values, "get_seq_length"):
+            past_len = past_key_values.get_seq_length()
+        else:
+            past_len = past_key_values[0][0].shape[-2]
+        if past_len == 0 or attention_mask.shape != (1, past_len + 1):
+            return None
+        return next((b for b in self.BUCKETS if b > past_len), None)
+
+    def _static_inputs(self, bucket: int, past, attention_mask):
+        """Copy the cache and mask into the bucket's static buffers (only new tokens if possible)."""
+        import torch
+
+        legacy = past.to_legacy_cache() if hasattr(past, "to_legacy_cache") else past
+        past_len = legacy[0][0].shape[-2]
+        key = (bucket, legacy[0][0].dtype, attention_mask.dtype)
+        if key not in self._buffers:
+            def static(t):
+                torch._dynamo.mark_static_address(t)
+                return t
+
+            k0 = legacy[0][0]
+            shape = (*k0.shape[:-2], bucket, k0.shape[-1])
+            self._buffers[key] = [
+                [static(k0.new_zeros(shape)) for _ in legacy],
+                [static(k0.new_zeros(shape)) for _ in legacy],
+                static(attention_mask.new_zeros((1, bucket + 1))),
+                static(torch.tensor([bucket], device=k0.device)),
+                None,
+                0,
+            ]
+        entry = self._buffers[key]
+        keys, values, mask, cache_position, owner, filled = entry
+
+        # A cache object that only grew since the last step needs its new tokens copied
+        start = filled if owner is not None and owner() is past and filled <= past_len else 0
+        for (k, v), static_k, static_v in zip(legacy, keys, values):
+            static_k[..., start:past_len, :].copy_(k[..., start:, :])
+            static_v[..., start:past_len, :].copy_(v[..., start:, :])
+        try:
+            entry[4] = weakref.ref(past)
+        except TypeError:
+            # Legacy tuple caches are rebuilt every step
+            entry[4] = None
+        entry[5] = past_len
+
+        mask[:, :past_len].copy_(attention_mask[:, :-1])
+        mask[:, past_len:bucket].zero_()
+        mask[:, bucket:].copy_(attention_mask[:, -1:])
+        return keys, values, mask, cache_position
+
+    def __call__(self, *args, inputs_embeds=None, past_key_values=None, attention_mask=None, **kwargs):
+        bucket = self._bucket(inputs_embeds, past_key_values, attention_mask, args, kwargs)
+        if bucket is None:
+            return self.eager_forward(
+                *args, inputs_embeds=inputs_embeds, past_key_values=past_key_values,
+                attention_mask=attention_mask, **kwargs,
+            )
+
+        import torch
+        from transformers.modeling_outputs import BaseModelOutputWithPastAndCrossAttentions
+
+        output_hidden_states = bool(kwargs.get("output_hidden_states"))
+        keys, values, mask, cache_position = self._static_inputs(bucket, past_key_values, attention_mask)
+        self._template = (inputs_embeds.dtype, keys[0].dtype, mask.dtype, output_hidden_states)
+        # Outputs of the previous replay are overwritten by this one
+        torch.compiler.cudagraph_mark_step_begin()
+        try:
+            hidden, new_keys, new_values, hidden_states = self._compiled(
+                inputs_embeds, keys, values, mask, cache_position, output_hidden_states
+            )
+        except Exception as e:
+            logger.warning(f"CUDA graph decode step failed, using eager decoder: {e}")
+            self.uninstall()
+            return self.eager_forward(
+                inputs_embeds=inputs_embeds, past_key_values=past_key_values,
+                attention_mask=attention_mask, **kwargs,
+            )
+
+        if hasattr(past_key_values, "update"):
+            for layer, (k, v) in enumerate(zip(new_keys, new_values)):
+                past_key_values.update(k, v, layer)
+            present = past_key_values
+        else:
+            present = tuple(
+                (torch.cat([pk, k], dim=-2), torch.cat([pv, v], dim=-2))
+                for (pk, pv), k, v in zip(past_key_values, new_keys, new_values)
+            )
+        output = BaseModelOutputWithPastAndCrossAttentions(
+            last_hidden_state=hidden.clone(),
+            past_key_values=present,
+            hidden_states=tuple(h.clone() for h in hidden_states) if hidden_states is not None else None,
+        )
+        return output if kwargs.get("return_dict", True) is not False else output.to_tuple()
+
+    def warm_up(self):
+        """Capture every bucket with the dtypes of the last graphed call."""
+        if self._template is None:
+            return
+        import torch
+
+        embeds_dtype, kv_dtype, mask_dtype, output_hidden_states = self._template
+        config = self.transformer.config
+        device = next(self.transformer.parameters()).device
+        head_dim = config.n_embd // config.n_head
+        embeds = torch.zeros((1, 1, config.n_embd), dtype=embeds_dtype, device=device)
+        for bucket in self.BUCKETS:
+            past_len = bucket - 1
+            past = tuple(
+                (
+                    torch.zeros((1, config.n_head, past_len, head_dim), dtype=kv_dtype, device=device),
+                    torch.zeros((1, config.n_head, past_len, head_dim), dtype=kv_dtype, device=device),
+                )
+                for _ in range(config.n_layer)
+            )
+            mask = torch.ones((1, past_len + 1), dtype=mask_dtype, device=device)
+            self(
+                inputs_embeds=embeds, past_key_values=past, attention_mask=mask,
+                use_cache=True, output_hidden_states=output_hidden_states, return_dict=True,
+            )
 
 
 class XTTSTTS(BaseTTS):
     """XTTS v2 TTS engine with voice cloning capability."""
 
+    # Loaded models shared across instances,
+    # keyed by (model name, device, deepspeed, cuda graphs, quantization)
+    _MODEL_CACHE: dict[tuple[str, str, bool, bool, str], "TTS"] = {}
+
     def __init__(
         self,
         reference_audio: str | Path,
         language: str = "en",
         device: Optional[str] = None,
+        half: bool = True,
+        use_deepspeed: bool = True,
+        cuda_graphs: bool = False,
+        quantization: Literal["fp32", "bf16", "int8"] = "fp32",
+        use_daemon: bool = True,
+        daemon_socket: str | Path = DEFAULT_SOCKET_PATH,
     ):
         """Initialize XTTS TTS engine.
 
@@ -33,12 +312,27 @@ class XTTSTTS(BaseTTS):
                            XTTS v2 requires a speaker reference for synthesis.
             language: Language code (en, es, fr, de, it, pt, pl, tr, ru, nl, cs, ar, zh-cn, hu, ko, ja, hi)
             device: Device to use ("cuda" or "cpu"). Auto-detects if None.
+            half: Run inference under FP16 autocast (CUDA only).
+            use_deepspeed: Use DeepSpeed inference kernels for the GPT decoder
+                          (CUDA only, ignored if deepspeed is not installed).
+            cuda_graphs: Replay the single-token GPT decoder step from CUDA graphs
+                        captured at padded KV-cache lengths of 64/128/256/512
+                        (CUDA only, used instead of DeepSpeed). Longer caches and
+                        failed captures fall back to the eager decoder.
+            quantization: Weight precision of the GPT decoder (CUDA only, used instead
+                         of DeepSpeed). "bf16" casts it to bfloat16; "int8" also swaps
+                         the transformer's linear layers for bitsandbytes int8 layers
+                         (falls back to bf16 if bitsandbytes is not installed). The
+                         HiFi-GAN vocoder always stays FP32.
+            use_daemon: Send synthesize() requests to a running XTTS daemon
+                       (see vidchat.tts.xtts_daemon) instead of loading the model here.
+            daemon_socket: Unix socket of the XTTS daemon.
 
         Raises:
             ImportError: If coqui-tts is not installed.
             FileNotFoundError: If reference_audio doesn't exist.
         """
-        if not XTTS_AVAILABLE:
+        if not _xtts_available():
             raise ImportError(
                 "coqui-tts is not installed. Install with: uv sync --extra voice-cloning"
             )
@@ -50,17 +344,151 @@ class XTTSTTS(BaseTTS):
         if not self.reference_audio.exists():
             raise FileNotFoundError(f"Reference audio not found: {self.reference_audio}")
 
+        self.device = device
+        self.tts = None
+        self._half = half
+        self._use_deepspeed = use_deepspeed
+        self._cuda_graphs = cuda_graphs
+        self._quantization = quantization
+
+        # If an XTTS daemon is running, synthesize() goes through it and the
+        # model is only loaded here if the daemon goes away
+        self.daemon_socket = daemon_socket if use_daemon and is_running(daemon_socket) else None
+        if self.daemon_socket is None:
+            self._load_local()
+
+    def _load_local(self):
+        """Load the model into this process (reused if already loaded)."""
         # Auto-detect device
-        if device is None:
+        if self.device is None:
             import torch
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.device = device
+            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        quantization = self._quantization if self.device == "cuda" else "fp32"
+        # Reduced-precision weights need autocast so FP32 activations match them
+        self.half = (self._half or quantization != "fp32") and self.device == "cuda"
+        self._autocast_dtype = "bfloat16" if quantization == "bf16" else "float16"
+
+        # Initialize XTTS v2 model (reused if already loaded in this process)
+        cuda_graphs = self._cuda_graphs and self.device == "cuda"
+        use_deepspeed = (
+            self._use_deepspeed and self.device == "cuda" and not cuda_graphs and quantization == "fp32"
+        )
+        self.tts = self._load_model(self.device, use_deepspeed, cuda_graphs, quantization)
+
+        # Speaker conditioning is computed once from the reference audio and
+        # recomputed only if the file changes on disk
+        self._conditioning_mtime: float | None = None
+        self._get_conditioning()
+
+        if cuda_graphs:
+            self._warm_up_decoder()
+
+    @classmethod
+    def _load_model(
+        cls,
+        device: str,
+        use_deepspeed: bool,
+        cuda_graphs: bool = False,
+        quantization: str = "fp32",
+    ) -> "TTS":
+        """Load the XTTS v2 model, or return the cached instance.
+
+        Args:
+            device: Device to load onto
+            use_deepspeed: Re-initialize the GPT decoder with DeepSpeed inference
+            cuda_graphs: Replay the GPT decoder step from bucketed CUDA graphs
+            quantization: GPT decoder weight precision ("fp32", "bf16" or "int8")
+
+        Returns:
+            Loaded TTS API object
+        """
+        if use_deepspeed:
+            try:
+                import deepspeed  # noqa: F401
+            except ImportError:
+                use_deepspeed = False
+        if quantization == "int8":
+            try:
+                import bitsandbytes  # noqa: F401
+            except ImportError:
+                logger.warning("bitsandbytes is not installed, using bf16 instead of int8")
+                quantization = "bf16"
+
+        key = (XTTS_MODEL_NAME, device, use_deepspeed, cuda_graphs, quantization)
+        if key not in cls._MODEL_CACHE:
+            from TTS.api import TTS
 
-        # Initialize XTTS v2 model
-        print(f"Loading XTTS v2 model on {self.device}...")
-        self.tts = TTS("tts_models/multilingual/multi-dataset/xtts_v2", progress_bar=False)
-        self.tts.to(self.device)
-        print("✓ XTTS v2 loaded")
+            logger.info(f"Loading XTTS v2 model on {device}...")
+            tts = TTS(XTTS_MODEL_NAME, progress_bar=False)
+            tts.to(device)
+            _cache_tokenizer(tts.synthesizer.tts_model.tokenizer)
+            if quantization != "fp32":
+                cls._quantize_gpt(tts.synthesizer.tts_model, quantization)
+            if use_deepspeed:
+                model = tts.synthesizer.tts_model
+                model.gpt.init_gpt_for_inference(kv_cache=model.args.kv_cache, use_deepspeed=True)
+            if cuda_graphs:
+                # Per-token decode at batch 1 is launch-bound; replay it from
+                # CUDA graphs captured at a few padded cache lengths
+                gpt_inference = tts.synthesizer.tts_model.gpt.gpt_inference
+                gpt_inference._decode_step = _BucketedDecodeStep(gpt_inference.transformer)
+                gpt_inference._decode_step.install()
+            cls._MODEL_CACHE[key] = tts
+            logger.info(
+                f"✓ XTTS v2 loaded{' (DeepSpeed)' if use_deepspeed else ''}"
+                f"{f' ({quantization} GPT)' if quantization != 'fp32' else ''}"
+            )
+        return cls._MODEL_CACHE[key]
+
+    @staticmethod
+    def _quantize_gpt(model, quantization: str):
+        """Reduce GPT decoder weight precision in place (the vocoder is left in FP32).
+
+        Decoding at batch 1 is bound by weight reads, so smaller weights mean
+        proportionally less memory traffic per token.
+        """
+        import torch
+
+        model.gpt.to(torch.bfloat16)
+        if quantization == "int8":
+            _swap_linear_int8(model.gpt.gpt)
+        # gpt_inference holds its own references to GPT submodules; rebuild it
+        model.gpt.init_gpt_for_inference(kv_cache=model.args.kv_cache, use_deepspeed=False)
+
+    def _warm_up_decoder(self):
+        """Capture decoder graphs for every bucket at load time instead of during requests."""
+        import torch
+
+        decode_step = self.tts.synthesizer.tts_model.gpt.gpt_inference._decode_step
+        try:
+            # A real synthesis records the dtypes and flags the decoder runs with
+            for _ in self.synthesize_stream("Hello."):
+                pass
+            with torch.inference_mode(), self._autocast():
+                decode_step.warm_up()
+        except Exception as e:
+            logger.warning(f"CUDA graph warm-up failed, using eager decoder: {e}")
+            decode_step.uninstall()
+
+    def _get_conditioning(self):
+        """Get cached (gpt_cond_latent, speaker_embedding) for the reference audio."""
+        mtime = self.reference_audio.stat().st_mtime
+        if mtime != self._conditioning_mtime:
+            with self._autocast():
+                self.gpt_cond_latent, self.speaker_embedding = (
+                    self.tts.synthesizer.tts_model.get_conditioning_latents(
+                        audio_path=[str(self.reference_audio)]
+                    )
+                )
+            self._conditioning_mtime = mtime
+        return self.gpt_cond_latent, self.speaker_embedding
+
+    def _autocast(self):
+        """FP16 (BF16 for bf16 weights) autocast context on CUDA when enabled."""
+        if not self.half:
+            return contextlib.nullcontext()
+        import torch
+        return torch.autocast("cuda", dtype=getattr(torch, self._autocast_dtype))
 
     def synthesize(self, text: str, output_path: str | Path) -> str:
         """Synthesize speech from text using voice cloning.
@@ -72,23 +500,122 @@ class XTTSTTS(BaseTTS):
         Returns:
             Path to the generated audio file
         """
+        import soundfile as sf
+
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Voice cloning with reference audio
-        wav = self.tts.tts(
+        if self.daemon_socket is not None:
+            try:
+                return request_synthesis(
+                    text, output_path, self.reference_audio, self.language, self.daemon_socket
+                )
+            except OSError as e:
+                logger.warning(f"XTTS daemon unavailable ({e}), synthesizing in-process")
+                self.daemon_socket = None
+                self._load_local()
+
+        # Write each chunk as it is decoded instead of buffering the whole waveform
+        with sf.SoundFile(
+            str(output_path),
+            mode="w",
+            samplerate=self.get_sample_rate(),
+            channels=1,
+            subtype="PCM_16",
+        ) as f:
+            for chunk in self.synthesize_stream(text):
+                f.write(chunk)
+
+        return str(output_path)
+
+    def synthesize_batch(self, texts: list[str], output_paths: list[str | Path]) -> list[str]:
+        """Synthesize several texts with the same voice.
+
+        Speaker conditioning is shared across the batch and WAV encoding runs
+        on a worker thread, overlapping with synthesis of the next text.
+
+        Args:
+            texts: Texts to synthesize
+            output_paths: Output path for each text
+
+        Returns:
+            Paths to the generated audio files
+        """
+        if len(texts) != len(output_paths):
+            raise ValueError("texts and output_paths must have the same length")
+
+        import numpy as np
+        import soundfile as sf
+
+        if self.tts is None:
+            self._load_local()
+
+        gpt_cond_latent, speaker_embedding = self._get_conditioning()
+        paths = [Path(p) for p in output_paths]
+        sample_rate = self.get_sample_rate()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            writes = []
+            for text, path in zip(texts, paths):
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with self._autocast():
+                    out = self.tts.synthesizer.tts_model.inference(
+                        text=text,
+                        language=self.language,
+                        gpt_cond_latent=gpt_cond_latent,
+                        speaker_embedding=speaker_embedding,
+                        enable_text_splitting=True,
+                    )
+                wav = np.asarray(out["wav"], dtype=np.float32)
+                writes.append(
+                    executor.submit(sf.write, str(path), wav, sample_rate, subtype="PCM_16")
+                )
+            for write in writes:
+                write.result()
+
+        return [str(p) for p in paths]
+
+    def synthesize_stream(
+        self,
+        text: str,
+        stream_chunk_size: int = 20,
+        overlap_wav_len: int = 1024,
+    ) -> Iterator["np.ndarray"]:
+        """Synthesize speech incrementally, yielding audio as it is decoded.
+
+        Args:
+            text: Text to synthesize
+            stream_chunk_size: GPT tokens decoded per yielded chunk
+            overlap_wav_len: Samples cross-faded between consecutive chunks
+
+        Yields:
+            Float32 audio chunks at get_sample_rate()
+        """
+        if self.tts is None:
+            self._load_local()
+
+        # Voice cloning with cached speaker conditioning
+        gpt_cond_latent, speaker_embedding = self._get_conditioning()
+        stream = self.tts.synthesizer.tts_model.inference_stream(
             text=text,
-            speaker_wav=str(self.reference_audio),
             language=self.language,
+            gpt_cond_latent=gpt_cond_latent,
+            speaker_embedding=speaker_embedding,
+            stream_chunk_size=stream_chunk_size,
+            overlap_wav_len=overlap_wav_len,
+            enable_text_splitting=True,
         )
-
-        # Save audio
-        self.tts.synthesizer.save_wav(wav, str(output_path))
-        return str(output_path)
+        while True:
+            # Autocast only around decoding so it doesn't leak into the consumer
+            with self._autocast():
+                chunk = next(stream, None)
+            if chunk is None:
+                return
+            yield chunk.float().cpu().numpy()
 
     def is_available(self) -> bool:
         """Check if XTTS is available."""
-        return XTTS_AVAILABLE
+        return _xtts_available()
 
     def get_sample_rate(self) -> int:
         """Get the sample rate of generated audio."""
@@ -122,6 +649,12 @@ class XTTSTTS(BaseTTS):
 if __name__ == "__main__":
     import sys
 
+    from vidchat.utils import setup_logger
+
+    # Show model loading progress (this module logs as "__main__" when run directly)
+    setup_logger("vidchat")
+    setup_logger(logger.name)
+
     if len(sys.argv) < 2:
         print("Usage: python xtts.py <reference_audio.wav>")
         print("\nXTTS v2 requires a reference audio file (6+ seconds) for voice cloning.")
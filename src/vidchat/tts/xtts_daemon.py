@@ -0,0 +1,221 @@
+"""Long-lived XTTS v2 synthesis server.
+
+Loading XTTS v2 and initializing CUDA takes several seconds, so this daemon loads
+the model once and serves synthesis requests over a Unix socket. XTTSTTS uses it
+automatically when the socket is reachable and falls back to in-process synthesis
+otherwise.
+
+Protocol: one JSON object per line.
+    Request:  {"text": ..., "out": ..., "reference_audio": ..., "language": ...}
+    Reply:    {"ok": true, "out": ...} or {"ok": false, "error": ...}
+
+The socket is only accessible to the user running the daemon, and "out" must lie
+inside one of the daemon's allowed output directories (the temp dir and
+vidchat's output dir unless configured otherwise).
+
+Usage:
+    python -m vidchat.tts.xtts_daemon [--socket PATH] [--device cuda] [--allow-output-dir DIR ...]
+"""
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import tempfile
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# The per-user runtime dir (mode 0700) when available, so other users can't
+# squat on the path; the daemon restricts the socket itself to its owner either way
+DEFAULT_SOCKET_PATH = os.path.join(os.environ.get("XDG_RUNTIME_DIR") or "/tmp", "vidchat-xtts.sock")
+
+
+def default_output_dirs() -> list[Path]:
+    """Directories the daemon writes to unless told otherwise."""
+    from vidchat.config.settings import OUTPUT_DIR
+
+    return [Path(tempfile.gettempdir()), OUTPUT_DIR]
+
+
+def is_running(socket_path: str | Path = DEFAULT_SOCKET_PATH) -> bool:
+    """Check whether a daemon is listening on the socket."""
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+
+
+def request_synthesis(
+    text: str,
+    output_path: str | Path,
+    reference_audio: str | Path,
+    language: str,
+    socket_path: str | Path = DEFAULT_SOCKET_PATH,
+    timeout: float = 300.0,
+) -> str:
+    """Ask the daemon to synthesize text to a file.
+
+    Args:
+        text: Text to synthesize
+        output_path: Path the daemon should write the audio to
+        reference_audio: Reference audio for voice cloning
+        language: Language code
+        socket_path: Daemon socket
+        timeout: Seconds to wait for the reply
+
+    Returns:
+        Path to the generated audio file
+
+    Raises:
+        OSError: If the daemon can't be reached (e.g. ConnectionRefusedError).
+        RuntimeError: If the daemon reports a synthesis error.
+    """
+    request = {
+        "text": text,
+        "out": str(Path(output_path).resolve()),
+        "reference_audio": str(Path(reference_audio).resolve()),
+        "language": language,
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        with sock.makefile("rwb") as f:
+            f.write(json.dumps(request).encode() + b"\n")
+            f.flush()
+            line = f.readline()
+
+    if not line:
+        raise ConnectionResetError("XTTS daemon closed the connection")
+    reply = json.loads(line)
+    if not reply.get("ok"):
+        raise RuntimeError(f"XTTS daemon error: {reply.get('error')}")
+    return reply["out"]
+
+
+class _SynthesisHandler(socketserver.StreamRequestHandler):
+    """Handle newline-delimited JSON synthesis requests on one connection."""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                out = self.server.check_output_path(request["out"])
+                engine = self.server.get_engine(
+                    request["reference_audio"], request.get("language", "en")
+                )
+                out = engine.synthesize(request["text"], out)
+                reply = {"ok": True, "out": out}
+            except Exception as e:
+                logger.exception("Synthesis request failed")
+                reply = {"ok": False, "error": str(e)}
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+            self.wfile.flush()
+
+
+class XTTSDaemon(socketserver.UnixStreamServer):
+    """Unix socket server holding loaded XTTS engines.
+
+    Requests are handled one at a time so synthesis never contends for the GPU.
+    Engines are kept per (reference audio, language); they all share the same
+    loaded model through XTTSTTS's model cache.
+    """
+
+    def __init__(
+        self,
+        socket_path: str | Path = DEFAULT_SOCKET_PATH,
+        device: Optional[str] = None,
+        output_dirs: Optional[Iterable[str | Path]] = None,
+    ):
+        self.socket_path = Path(socket_path)
+        self.device = device
+        self.output_dirs = [
+            Path(d).resolve() for d in (output_dirs if output_dirs is not None else default_output_dirs())
+        ]
+        self._engines = {}
+
+        # Remove a stale socket left by a previous run
+        if self.socket_path.exists():
+            if is_running(self.socket_path):
+                raise RuntimeError(f"XTTS daemon already running on {self.socket_path}")
+            self.socket_path.unlink()
+
+        super().__init__(str(self.socket_path), _SynthesisHandler)
+
+    def server_bind(self):
+        # Create the socket owner-only from the start; a chmod after bind
+        # would leave a window where anyone could connect
+        old_umask = os.umask(0o077)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(old_umask)
+
+    def check_output_path(self, out: str) -> str:
+        """Resolve a requested output path, rejecting ones outside the allowed directories."""
+        path = Path(out).resolve()
+        if not any(path.is_relative_to(d) for d in self.output_dirs):
+            raise PermissionError(f"Output path not in an allowed directory: {out}")
+        return str(path)
+
+    def get_engine(self, reference_audio: str, language: str):
+        """Get (or create) the engine for a reference voice."""
+        from vidchat.tts.xtts import XTTSTTS
+
+        key = (reference_audio, language)
+        if key not in self._engines:
+            self._engines[key] = XTTSTTS(
+                reference_audio=reference_audio,
+                language=language,
+                device=self.device,
+                use_daemon=False,
+            )
+        return self._engines[key]
+
+    def server_close(self):
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from vidchat.tts.xtts import XTTS_MODEL_NAME, XTTSTTS
+
+    parser = argparse.ArgumentParser(description="Serve XTTS v2 synthesis over a Unix socket")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Socket path")
+    parser.add_argument("--device", default=None, help="Device (cuda or cpu); auto-detected if omitted")
+    parser.add_argument(
+        "--allow-output-dir", action="append", default=None, metavar="DIR",
+        help="Directory clients may write audio to (repeatable; default: temp dir and vidchat output dir)",
+    )
+    args = parser.parse_args()
+
+    from vidchat.utils import setup_logger
+
+    # XTTSTTS logs model loading under "vidchat"; this module's own logger is "__main__"
+    setup_logger("vidchat")
+    setup_logger(logger.name)
+
+    server = XTTSDaemon(args.socket, device=args.device, output_dirs=args.allow_output_dir)
+
+    # Load the model up front so the first request doesn't pay for it
+    device = args.device
+    if device is None:
+        import torch
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+    XTTSTTS._load_model(device, use_deepspeed=device == "cuda")
+
+    print(f"✓ XTTS daemon ({XTTS_MODEL_NAME}) listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -3,76 +3,152 @@
 Loads configuration from config.yaml file with fallback defaults.
 """
 
+import functools
+import json
+import logging
 import yaml
 from pathlib import Path
-from typing import Any, Dict
-from dataclasses import dataclass
-
-
-@dataclass
-class PathConfig:
-    """Path configuration."""
-    data_dir: Path
-    models_dir: Path
-    output_dir: Path
-    external_dir: Path
-    sadtalker_dir: Path
-    rvc_dir: Path
-    voice_data: Path
-    training_data: Path
-    downloads: Path
-    logs: Path
-
-
-@dataclass
-class VoiceTrainingConfig:
+from typing import Any, Dict, Literal
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, model_validator
+
+logger = logging.getLogger(__name__)
+
+# Prefer the LibYAML-backed loader; the pure-Python one is several times slower
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+if _YAML_LOADER is yaml.SafeLoader:
+    logger.warning(
+        "PyYAML was built without LibYAML; using the slower pure-Python loader. "
+        "Install libyaml-dev and reinstall PyYAML to enable yaml.CSafeLoader."
+    )
+
+
+class _Section(BaseModel):
+    """Base for config sections; unknown keys (e.g. typos, stale options) are ignored with a warning."""
+    model_config = ConfigDict(extra="ignore")
+
+    @model_validator(mode="before")
+    @classmethod
+    def _warn_unknown_keys(cls, data: Any) -> Any:
+        if isinstance(data, dict):
+            unknown = sorted(str(key) for key in set(data) - set(cls.model_fields))
+            if unknown:
+                logger.warning(f"Ignoring unknown {cls.__name__} keys in config: {', '.join(unknown)}")
+        return data
+
+
+def _project_root(info: ValidationInfo) -> Path:
+    """Project root passed in the validation context (falls back to auto-detection)."""
+    if info.context and "project_root" in info.context:
+        return info.context["project_root"]
+    return get_project_root()
+
+
+class PathConfig(_Section):
+    """Path configuration.
+
+    Paths are resolved against the project root; voice_data, training_data,
+    downloads and logs are relative to data_dir.
+    """
+    data_dir: Path = Path(".data")
+    models_dir: Path = Path("models")
+    output_dir: Path = Path("output")
+    external_dir: Path = Path("external")
+    sadtalker_dir: Path = Path("external/SadTalker")
+    rvc_dir: Path = Path("external/RVC")
+    voice_data: Path = Path("voice_data")
+    training_data: Path = Path("training")
+    downloads: Path = Path("downloads")
+    logs: Path = Path("logs")
+
+    @model_validator(mode="after")
+    def _resolve(self, info: ValidationInfo) -> "PathConfig":
+        project_root = _project_root(info)
+        self.data_dir = project_root / self.data_dir
+        self.models_dir = project_root / self.models_dir
+        self.output_dir = project_root / self.output_dir
+        self.external_dir = project_root / self.external_dir
+        self.sadtalker_dir = project_root / self.sadtalker_dir
+        self.rvc_dir = project_root / self.rvc_dir
+        self.voice_data = self.data_dir / self.voice_data
+        self.training_data = self.data_dir / self.training_data
+        self.downloads = self.data_dir / self.downloads
+        self.logs = self.data_dir / self.logs
+        return self
+
+
+class VoiceTrainingConfig(_Section):
     """Voice training configuration."""
-    voice_name: str
-    training_urls: list[str]
-    epochs: int
-    batch_size: int
-    sample_rate: int
-    segment_length: int
-    min_segment_length: int
-    silence_threshold: int
-
-
-@dataclass
-class AppSettings:
+    voice_name: str = "my_voice"
+    training_urls: list[str] = Field(default_factory=list)
+    epochs: int = 300
+    batch_size: int = 4
+    sample_rate: int = 40000
+    segment_length: int = 10
+    min_segment_length: int = 3
+    silence_threshold: int = -40
+    copy_mode: Literal["symlink", "hardlink", "copy"] = "symlink"  # How wavs are staged for RVC
+
+
+class AppSettings(_Section):
     """Application settings."""
-    window_name: str
-    fps: int
-    width: int
-    height: int
+    window_name: str = "VidChat"
+    fps: int = 30
+    width: int = 800
+    height: int = 600
 
 
-@dataclass
-class XTTSConfig:
+class XTTSConfig(_Section):
     """XTTS voice cloning configuration."""
     reference_audio: Path
     language: str = "en"
 
+    @model_validator(mode="after")
+    def _resolve(self, info: ValidationInfo) -> "XTTSConfig":
+        self.reference_audio = self.reference_audio.expanduser()
+        # Make relative to project root if not absolute
+        if not self.reference_audio.is_absolute():
+            self.reference_audio = _project_root(info) / self.reference_audio
+        return self
 
-@dataclass
-class TTSConfig:
+
+class TTSConfig(_Section):
     """TTS configuration."""
-    provider: str  # "piper", "xtts", or "hybrid"
-    piper_model: str
+    provider: str = "piper"  # "piper", "xtts", or "hybrid"
+    piper_model: str = "en_US-lessac-medium"
     xtts: XTTSConfig | None = None
 
 
-@dataclass
-class VidChatConfig:
-    """Main VidChat configuration."""
+class VidChatConfig(BaseModel):
+    """Main VidChat configuration.
+
+    Sections without a model here (ai, avatar, web, ...) are kept as extra
+    fields and in raw_config.
+    """
+    model_config = ConfigDict(extra="allow")
+
     voice_training: VoiceTrainingConfig
     paths: PathConfig
     app: AppSettings
     tts: TTSConfig
     raw_config: Dict[str, Any]
 
+    @model_validator(mode="before")
+    @classmethod
+    def _fill_sections(cls, data: Any) -> Any:
+        raw = data or {}
+        data = dict(raw)
+        # Missing or empty sections fall back to their defaults
+        for section in ("voice_training", "paths", "app", "tts"):
+            if data.get(section) is None:
+                data[section] = {}
+        data["raw_config"] = raw
+        return data
+
 
+@functools.cache
 def get_project_root() -> Path:
-    """Get the project root directory."""
+    """Get the project root directory (resolved once per process)."""
     # Start from this file and go up to find pyproject.toml
     current = Path(__file__).resolve()
     for parent in current.parents:
@@ -82,9 +158,39 @@ def get_project_root() -> Path:
     return Path.cwd()
 
 
+def _read_config_dict(config_path: Path) -> Dict[str, Any]:
+    """Read the raw config dict, using a JSON copy of the YAML when it is fresh.
+
+    The JSON copy is written next to the YAML file as ``<name>.yaml.json`` and is
+    reused as long as it is not older than the YAML file.
+    """
+    cache_path = config_path.with_suffix(config_path.suffix + ".json")
+    try:
+        if cache_path.stat().st_mtime >= config_path.stat().st_mtime:
+            with open(cache_path, 'r') as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    with open(config_path, 'r') as f:
+        config_dict = yaml.load(f, Loader=_YAML_LOADER)
+
+    try:
+        with open(cache_path, 'w') as f:
+            json.dump(config_dict, f)
+    except (OSError, TypeError):
+        # Read-only location or values JSON can't represent - just skip the cache
+        cache_path.unlink(missing_ok=True)
+
+    return config_dict
+
+
 def load_config(config_path: str | Path | None = None) -> VidChatConfig:
     """Load configuration from YAML file.
 
+    Files are parsed once per path for the lifetime of the process; each call
+    returns its own copy, so callers may modify it freely.
+
     Args:
         config_path: Path to config file. If None, looks for config.yaml in project root.
 
@@ -94,6 +200,7 @@ def load_config(config_path: str | Path | None = None) -> VidChatConfig:
     Raises:
         FileNotFoundError: If config file doesn't exist.
         yaml.YAMLError: If config file is invalid.
+        pydantic.ValidationError: If config values don't match the schema.
     """
     if config_path is None:
         project_root = get_project_root()
@@ -101,81 +208,25 @@ def load_config(config_path: str | Path | None = None) -> VidChatConfig:
     else:
         config_path = Path(config_path)
 
+    return _load_config_cached(str(config_path)).model_copy(deep=True)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(config_path_str: str) -> VidChatConfig:
+    """Load and parse the config file at the given path (cached)."""
+    config_path = Path(config_path_str)
+
     if not config_path.exists():
         raise FileNotFoundError(
             f"Config file not found: {config_path}\n"
             f"Create config.yaml in project root or specify path."
         )
 
-    with open(config_path, 'r') as f:
-        config_dict = yaml.safe_load(f)
-
-    # Get project root for resolving relative paths
-    project_root = get_project_root()
-
-    # Parse paths
-    paths_dict = config_dict.get('paths', {})
-    paths = PathConfig(
-        data_dir=project_root / paths_dict.get('data_dir', '.data'),
-        models_dir=project_root / paths_dict.get('models_dir', 'models'),
-        output_dir=project_root / paths_dict.get('output_dir', 'output'),
-        external_dir=project_root / paths_dict.get('external_dir', 'external'),
-        sadtalker_dir=project_root / paths_dict.get('sadtalker_dir', 'external/SadTalker'),
-        rvc_dir=project_root / paths_dict.get('rvc_dir', 'external/RVC'),
-        voice_data=project_root / paths_dict.get('data_dir', '.data') / paths_dict.get('voice_data', 'voice_data'),
-        training_data=project_root / paths_dict.get('data_dir', '.data') / paths_dict.get('training_data', 'training'),
-        downloads=project_root / paths_dict.get('data_dir', '.data') / paths_dict.get('downloads', 'downloads'),
-        logs=project_root / paths_dict.get('data_dir', '.data') / paths_dict.get('logs', 'logs'),
-    )
-
-    # Parse voice training config
-    vt_dict = config_dict.get('voice_training', {})
-    voice_training = VoiceTrainingConfig(
-        voice_name=vt_dict.get('voice_name', 'my_voice'),
-        training_urls=vt_dict.get('training_urls', []),
-        epochs=vt_dict.get('epochs', 300),
-        batch_size=vt_dict.get('batch_size', 4),
-        sample_rate=vt_dict.get('sample_rate', 40000),
-        segment_length=vt_dict.get('segment_length', 10),
-        min_segment_length=vt_dict.get('min_segment_length', 3),
-        silence_threshold=vt_dict.get('silence_threshold', -40),
-    )
-
-    # Parse app settings
-    app_dict = config_dict.get('app', {})
-    app = AppSettings(
-        window_name=app_dict.get('window_name', 'VidChat'),
-        fps=app_dict.get('fps', 30),
-        width=app_dict.get('width', 800),
-        height=app_dict.get('height', 600),
-    )
-
-    # Parse TTS settings
-    tts_dict = config_dict.get('tts', {})
-    xtts_config = None
-    if 'xtts' in tts_dict:
-        xtts_dict = tts_dict['xtts']
-        ref_audio_path = Path(xtts_dict.get('reference_audio', '')).expanduser()
-        # Make relative to project root if not absolute
-        if not ref_audio_path.is_absolute():
-            ref_audio_path = project_root / ref_audio_path
-        xtts_config = XTTSConfig(
-            reference_audio=ref_audio_path,
-            language=xtts_dict.get('language', 'en'),
-        )
-
-    tts = TTSConfig(
-        provider=tts_dict.get('provider', 'piper'),
-        piper_model=tts_dict.get('piper_model', 'en_US-lessac-medium'),
-        xtts=xtts_config,
-    )
+    config_dict = _read_config_dict(config_path)
 
-    return VidChatConfig(
-        voice_training=voice_training,
-        paths=paths,
-        app=app,
-        tts=tts,
-        raw_config=config_dict,
+    # Validate every section in one pass; relative paths resolve against the project root
+    return VidChatConfig.model_validate(
+        config_dict, context={"project_root": get_project_root()}
     )
 
 
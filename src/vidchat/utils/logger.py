@@ -2,17 +2,20 @@
 Logging utilities for VidChat.
 """
 import logging
+import logging.handlers
 import sys
 from typing import Optional
 
 
-def setup_logger(name: str = "vidchat", level: str = "INFO") -> logging.Logger:
+def setup_logger(name: str = "vidchat", level: str = "INFO", buffered: bool = False) -> logging.Logger:
     """
     Setup logger with consistent formatting.
 
     Args:
         name: Logger name
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        buffered: Batch records in memory and write them every 128 records, on
+                  WARNING or above, or when the handler is flushed/closed
 
     Returns:
         Configured logger instance
@@ -27,6 +30,10 @@ def setup_logger(name: str = "vidchat", level: str = "INFO") -> logging.Logger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         handler.setFormatter(formatter)
+        if buffered:
+            handler = logging.handlers.MemoryHandler(
+                capacity=128, flushLevel=logging.WARNING, target=handler
+            )
         logger.addHandler(handler)
 
     logger.setLevel(getattr(logging, level.upper()))
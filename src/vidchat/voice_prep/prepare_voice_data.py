@@ -12,13 +12,18 @@ Note: With XTTS v2, you only need 6+ seconds of clean audio for voice cloning.
 No training is required!
 """
 
+import logging
+import os
 import subprocess
 import sys
 import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional
 import typer
 
+logger = logging.getLogger("vidchat.voice_prep")
+
 app = typer.Typer(help="Prepare voice data from YouTube URLs for voice cloning")
 
 
@@ -47,12 +52,16 @@ def check_dependencies() -> bool:
     return True
 
 
-def download_audio(url: str, output_path: Path) -> bool:
-    """Download audio from YouTube URL."""
-    print(f"Downloading: {url}")
+def download_audio(url: str, output_path: Path) -> list[Path]:
+    """Download audio from YouTube URL.
+
+    Returns:
+        Paths of the downloaded WAV files (empty on failure)
+    """
+    logger.info(f"Downloading: {url}")
 
     try:
-        subprocess.run(
+        result = subprocess.run(
             [
                 "yt-dlp",
                 "-x",  # Extract audio
@@ -60,151 +69,117 @@ def download_audio(url: str, output_path: Path) -> bool:
                 "wav",
                 "--audio-quality",
                 "0",  # Best quality
+                "--print",
+                "after_move:filepath",  # Report final paths instead of rescanning the directory
                 "-o",
                 str(output_path / "%(id)s.%(ext)s"),
                 url,
             ],
+            stdout=subprocess.PIPE,
+            text=True,
             check=True,
         )
-        return True
     except subprocess.CalledProcessError as e:
-        print(f"❌ Error downloading {url}: {e}")
-        return False
+        logger.error(f"❌ Error downloading {url}: {e}")
+        return []
+
+    return [Path(line) for line in result.stdout.splitlines() if line.strip()]
+
+
+def available_cores() -> int:
+    """Number of CPUs this process may run on (respects CPU affinity masks)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
 
 
 def process_audio(
-    input_file: Path, output_dir: Path, segment_length: int = 10
+    input_file: Path, output_dir: Path, segment_length: int = 10, threads: Optional[int] = None
 ) -> list[Path]:
-    """Process audio: normalize, remove silence, and segment."""
-    print(f"Processing: {input_file.name}")
+    """Process audio: normalize, remove silence, and segment.
 
-    # Create temp file for normalized audio
-    temp_normalized = output_dir / f"temp_normalized_{input_file.stem}.wav"
+    threads caps ffmpeg's decode/filter threads (defaults to all available cores).
+    """
+    threads = str(threads or available_cores())
+    logger.info(f"Processing: {input_file.name}")
 
-    # Step 1: Normalize and convert to mono 44.1kHz
-    print("  - Normalizing audio...")
+    # Normalize, trim silence and segment in a single ffmpeg pass: the input is
+    # decoded once and no intermediate WAVs are written to disk
+    logger.info(f"  - Normalizing, removing silence and segmenting into {segment_length}s clips...")
+    segment_pattern = f"segment_{input_file.stem}_[0-9][0-9][0-9][0-9].wav"
     try:
-        result = subprocess.run(
+        subprocess.run(
             [
                 "ffmpeg",
+                "-filter_threads",
+                threads,
                 "-i",
                 str(input_file),
+                "-threads",
+                threads,
                 "-ar",
                 "44100",  # 44.1kHz sample rate
                 "-ac",
                 "1",  # Mono
-                "-filter:a",
-                "loudnorm",  # Normalize loudness
+                "-af",
+                # Normalize loudness, then remove silence from beginning and end only
+                "loudnorm,silenceremove=start_periods=1:start_duration=0.5:start_threshold=-50dB:stop_periods=-1:stop_duration=0.5:stop_threshold=-50dB",
+                "-f",
+                "segment",
+                "-segment_time",
+                str(segment_length),
+                "-reset_timestamps",
+                "1",
+                "-acodec",
+                "pcm_s16le",  # 16-bit PCM
                 "-y",  # Overwrite
-                str(temp_normalized),
+                str(output_dir / f"segment_{input_file.stem}_%04d.wav"),
             ],
-            stdout=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
             stderr=subprocess.PIPE,
             check=True,
             text=True,
-            timeout=300,  # 5 minute timeout
+            timeout=600,  # 10 minute timeout
         )
     except subprocess.TimeoutExpired:
-        print(f"❌ Timeout normalizing audio (>5 minutes)")
+        logger.error(f"❌ Timeout processing {input_file.name} (>10 minutes)")
+        for partial in output_dir.glob(segment_pattern):
+            partial.unlink(missing_ok=True)
         return []
     except subprocess.CalledProcessError as e:
-        print(f"❌ Error normalizing audio: {e}")
+        logger.error(f"❌ Error processing {input_file.name}: {e}")
         if e.stderr:
-            print(f"   FFmpeg error: {e.stderr[-500:]}")  # Show last 500 chars
+            logger.error(f"   FFmpeg error: {e.stderr[-500:]}")  # Show last 500 chars
+        for partial in output_dir.glob(segment_pattern):
+            partial.unlink(missing_ok=True)
         return []
 
-    # Step 2: Remove silence from beginning/end only
-    temp_trimmed = output_dir / f"temp_trimmed_{input_file.stem}.wav"
-    print("  - Removing silence from start/end...")
-    try:
-        result = subprocess.run(
-            [
-                "ffmpeg",
-                "-i",
-                str(temp_normalized),
-                "-af",
-                "silenceremove=start_periods=1:start_duration=0.5:start_threshold=-50dB:stop_periods=-1:stop_duration=0.5:stop_threshold=-50dB",  # Remove silence from beginning and end only
-                "-y",
-                str(temp_trimmed),
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=True,
-            text=True,
-            timeout=300,  # 5 minute timeout
-        )
-    except subprocess.TimeoutExpired:
-        print(f"❌ Timeout removing silence (>5 minutes)")
-        temp_normalized.unlink(missing_ok=True)
-        return []
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error removing silence: {e}")
-        if e.stderr:
-            print(f"   FFmpeg error: {e.stderr[-500:]}")
-        temp_normalized.unlink(missing_ok=True)
-        return []
+    segments = sorted(output_dir.glob(segment_pattern))
+
+    # The trimmed length isn't known up front, so drop a short trailing clip
+    if segments and _probe_duration(segments[-1]) < segment_length - 0.1:
+        segments.pop().unlink(missing_ok=True)
+
+    logger.info(f"  ✓ Created {len(segments)} segments from {input_file.name}")
+    return segments
 
-    # Clean up temp file
-    temp_normalized.unlink(missing_ok=True)
 
-    # Step 3: Segment into fixed-length clips
-    print(f"  - Segmenting into {segment_length}s clips...")
-    segments = []
+def _probe_duration(audio_file: Path) -> float:
+    """Get the duration of an audio file in seconds (0.0 if it can't be read)."""
+    import soundfile as sf
 
+    # Read from the file header instead of spawning ffprobe
     try:
-        # Get duration
-        result = subprocess.run(
-            [
-                "ffprobe",
-                "-i",
-                str(temp_trimmed),
-                "-show_entries",
-                "format=duration",
-                "-v",
-                "quiet",
-                "-of",
-                "csv=p=0",
-            ],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        duration = float(result.stdout.strip())
-
-        # Create segments
-        num_segments = int(duration / segment_length)
-        for i in range(num_segments):
-            segment_file = output_dir / f"segment_{i:04d}.wav"
-            start_time = i * segment_length
-
-            subprocess.run(
-                [
-                    "ffmpeg",
-                    "-i",
-                    str(temp_trimmed),
-                    "-ss",
-                    str(start_time),
-                    "-t",
-                    str(segment_length),
-                    "-acodec",
-                    "pcm_s16le",  # 16-bit PCM
-                    "-y",
-                    str(segment_file),
-                ],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                check=True,
-            )
-            segments.append(segment_file)
-
-        print(f"  ✓ Created {len(segments)} segments")
+        info = sf.info(str(audio_file))
+    except RuntimeError:
+        return 0.0
+    return info.frames / info.samplerate
 
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error segmenting audio: {e}")
-    finally:
-        temp_trimmed.unlink(missing_ok=True)
 
-    return segments
+def _flush_log():
+    """Write out buffered progress records before printing a summary."""
+    for handler in logger.handlers:
+        handler.flush()
 
 
 @app.command()
@@ -218,12 +193,19 @@ def prepare(
     segment_length: int = typer.Option(
         10, "--segment-length", "-s", help="Segment length in seconds"
     ),
+    jobs: int = typer.Option(
+        0, "--jobs", "-j", help="Files to process in parallel (0 = half the available cores)"
+    ),
     output_dir: Optional[Path] = typer.Option(
         None, "--output", "-o", help="Output directory (auto-detected if not specified)"
     ),
 ):
     """Prepare voice data from YouTube URLs for voice cloning."""
 
+    # Progress from concurrent downloads/ffmpeg runs is logged in batches
+    from vidchat.utils.logger import setup_logger
+    setup_logger("vidchat.voice_prep", buffered=True)
+
     # Check dependencies first
     if not check_dependencies():
         raise typer.Exit(1)
@@ -280,18 +262,18 @@ def prepare(
     download_dir = output_dir / "downloads"
     download_dir.mkdir(exist_ok=True)
 
-    # Download all URLs
+    # Download all URLs concurrently (network-bound)
+    print(f"Downloading {len(urls)} URLs from YouTube...")
     downloaded_files = []
-    existing_files = set()  # Track already-seen files
-    for i, url in enumerate(urls, 1):
-        print(f"[{i}/{len(urls)}] Downloading from YouTube...")
-        if download_audio(url, download_dir):
-            # Find newly downloaded file
-            wav_files = list(download_dir.glob("*.wav"))
-            for f in wav_files:
-                if f not in existing_files:
-                    downloaded_files.append(f)
-                    existing_files.add(f)
+    with ThreadPoolExecutor(max_workers=min(8, len(urls))) as executor:
+        futures = {executor.submit(download_audio, url, download_dir): url for url in urls}
+        for future in as_completed(futures):
+            try:
+                downloaded_files.extend(future.result())
+            except Exception as e:
+                logger.error(f"❌ Error downloading {futures[future]}: {e}")
+    downloaded_files = sorted(set(downloaded_files))
+    _flush_log()
 
     if not downloaded_files:
         print("\n❌ No audio files were downloaded")
@@ -300,13 +282,29 @@ def prepare(
     print(f"\n✓ Downloaded {len(downloaded_files)} audio files")
     print()
 
-    # Process each downloaded file
+    # Process downloaded files concurrently (each runs its own ffmpeg processes)
     all_segments = []
-    for audio_file in downloaded_files:
-        segments = process_audio(audio_file, output_dir, segment_length)
-        all_segments.extend(segments)
-        # Clean up downloaded file (if processing succeeded)
-        audio_file.unlink(missing_ok=True)
+    # Split the cores between concurrent ffmpeg runs so total threads ≈ cores
+    cores = available_cores()
+    workers = max(1, min(jobs or cores // 2, len(downloaded_files)))
+    threads_per_job = max(1, cores // workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                process_audio, audio_file, output_dir, segment_length, threads_per_job
+            ): audio_file
+            for audio_file in downloaded_files
+        }
+        for future in as_completed(futures):
+            audio_file = futures[future]
+            try:
+                all_segments.extend(future.result())
+            except Exception as e:
+                logger.error(f"❌ Error processing {audio_file.name}: {e}")
+            # Clean up downloaded file
+            audio_file.unlink(missing_ok=True)
+    all_segments.sort()
+    _flush_log()
 
     # Clean up download directory (if empty)
     try:
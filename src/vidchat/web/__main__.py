@@ -0,0 +1,19 @@
+"""
+Run the VidChat web server: python -m vidchat.web [--host HOST] [--port PORT] [--reload]
+"""
+import argparse
+
+from .server import start_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VidChat web server")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind to")
+    parser.add_argument("--reload", action="store_true", help="Enable auto-reload for development")
+    args = parser.parse_args()
+    start_server(host=args.host, port=args.port, reload=args.reload)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,9 @@ import { ScrollArea } from './ui/scroll-area'
 import { cn } from '@/lib/utils'
 import { useWebSocket, type WebSocketMessage } from '@/hooks/useWebSocket'
 
+const WS_URL = 'ws://localhost:8000/ws/chat'
+const SERVER_URL = WS_URL.replace(/^ws/, 'http')
+
 interface Message {
   role: 'user' | 'assistant'
   content: string
@@ -25,13 +28,71 @@ export function Chat({ onFrameUpdate, onVideoUpdate, onProcessingChange, classNa
   const [isProcessing, setIsProcessing] = useState(false)
   const messagesEndRef = useRef<HTMLDivElement>(null)
   const audioRef = useRef<HTMLAudioElement | null>(null)
+  const audioChunksRef = useRef<ArrayBuffer[]>([])
+  const streamingRef = useRef(false)
+  const audioContextRef = useRef<AudioContext | null>(null)
+  // Speech played ahead of the video: source node and context time it started
+  const speechRef = useRef<{ source: AudioBufferSourceNode, startedAt: number } | null>(null)
+
+  const stopSpeech = () => {
+    const speech = speechRef.current
+    speechRef.current = null
+    if (!speech) return null
+    speech.source.onended = null
+    speech.source.stop()
+    return audioContextRef.current!.currentTime - speech.startedAt
+  }
+
+  const playSpeech = async (chunks: ArrayBuffer[]) => {
+    stopSpeech()
+    const context = audioContextRef.current ??= new AudioContext()
+    const wav = await new Blob(chunks).arrayBuffer()
+    const buffer = await context.decodeAudioData(wav)
+    const source = context.createBufferSource()
+    source.buffer = buffer
+    source.connect(context.destination)
+    source.onended = () => { speechRef.current = null }
+    source.start()
+    speechRef.current = { source, startedAt: context.currentTime }
+  }
 
   const handleMessage = (data: WebSocketMessage) => {
-    if (data.type === 'text') {
-      setMessages(prev => [...prev, {
-        role: 'assistant',
-        content: data.content || ''
-      }])
+    if (data.type === 'text_delta') {
+      // Grow the assistant message as the response streams in
+      const delta = data.content || ''
+      if (streamingRef.current) {
+        setMessages(prev => [...prev.slice(0, -1), {
+          role: 'assistant',
+          content: prev[prev.length - 1].content + delta
+        }])
+      } else {
+        streamingRef.current = true
+        setMessages(prev => [...prev, { role: 'assistant', content: delta }])
+      }
+    } else if (data.type === 'text') {
+      // Complete response; replaces the streamed message if there was one
+      const message: Message = { role: 'assistant', content: data.content || '' }
+      if (streamingRef.current) {
+        streamingRef.current = false
+        setMessages(prev => [...prev.slice(0, -1), message])
+      } else {
+        setMessages(prev => [...prev, message])
+      }
+    } else if (data.type === 'audio_start') {
+      // Binary audio chunks follow until audio_end
+      audioChunksRef.current = []
+    } else if (data.type === 'audio_end') {
+      // Play the speech right away; the lip-synced video follows later
+      playSpeech(audioChunksRef.current).catch(err =>
+        console.error('Error playing audio:', err)
+      )
+      audioChunksRef.current = []
+    } else if (data.type === 'video_url') {
+      // Generated MP4 is served over HTTP by the same server. If the speech
+      // is still playing, the video takes over from the same position.
+      const url = new URL(data.url || '', SERVER_URL).toString()
+      const elapsed = stopSpeech()
+      onVideoUpdate(elapsed === null ? url : `${url}#t=${elapsed.toFixed(2)}`)
     } else if (data.type === 'video') {
       // Handle video response (SadTalker)
       onVideoUpdate(`data:video/mp4;base64,${data.data}`)
@@ -52,6 +113,7 @@ export function Chat({ onFrameUpdate, onVideoUpdate, onProcessingChange, classNa
       setIsProcessing(false)
       onProcessingChange(false)
     } else if (data.type === 'error') {
+      streamingRef.current = false
       console.error('WebSocket error:', data.error)
       setIsProcessing(false)
       onProcessingChange(false)
@@ -63,8 +125,9 @@ export function Chat({ onFrameUpdate, onVideoUpdate, onProcessingChange, classNa
   }
 
   const { isConnected, isConnecting, sendMessage } = useWebSocket({
-    url: 'ws://localhost:8000/ws/chat',
+    url: WS_URL,
     onMessage: handleMessage,
+    onBinary: (chunk) => audioChunksRef.current.push(chunk),
     onOpen: () => console.log('WebSocket connected'),
     onClose: () => console.log('WebSocket disconnected'),
     onError: (error) => console.error('WebSocket error:', error)
@@ -1,10 +1,16 @@
 import { useEffect, useRef, useState, useCallback } from 'react'
+import { encode, decode } from '@msgpack/msgpack'
+
+// Offered to the server; if accepted, all messages are msgpack binary frames
+const MSGPACK_SUBPROTOCOL = 'vidchat.msgpack'
 
 export interface WebSocketMessage {
-  type: 'text' | 'audio' | 'video' | 'frame' | 'done' | 'error'
+  type: 'text' | 'text_delta' | 'audio' | 'audio_start' | 'audio_end' | 'video' | 'video_url' | 'chunk' | 'frame' | 'done' | 'error'
   content?: string
-  data?: string
+  url?: string
+  data?: string | Uint8Array
   format?: string
+  size?: number
   mouth_openness?: number
   error?: string
 }
@@ -12,6 +18,7 @@ export interface WebSocketMessage {
 interface UseWebSocketOptions {
   url: string
   onMessage?: (message: WebSocketMessage) => void
+  onBinary?: (data: ArrayBuffer) => void
   onOpen?: () => void
   onClose?: () => void
   onError?: (error: Event) => void
@@ -21,6 +28,7 @@ interface UseWebSocketOptions {
 export function useWebSocket({
   url,
   onMessage,
+  onBinary,
   onOpen,
   onClose,
   onError,
@@ -32,16 +40,18 @@ export function useWebSocket({
 
   // Store callbacks in refs to avoid recreating connect function
   const onMessageRef = useRef(onMessage)
+  const onBinaryRef = useRef(onBinary)
   const onOpenRef = useRef(onOpen)
   const onCloseRef = useRef(onClose)
   const onErrorRef = useRef(onError)
 
   useEffect(() => {
     onMessageRef.current = onMessage
+    onBinaryRef.current = onBinary
     onOpenRef.current = onOpen
     onCloseRef.current = onClose
     onErrorRef.current = onError
-  }, [onMessage, onOpen, onClose, onError])
+  }, [onMessage, onBinary, onOpen, onClose, onError])
 
   const connect = useCallback(() => {
     if (ws.current?.readyState === WebSocket.OPEN) {
@@ -49,7 +59,8 @@ export function useWebSocket({
     }
 
     setIsConnecting(true)
-    ws.current = new WebSocket(url)
+    ws.current = new WebSocket(url, [MSGPACK_SUBPROTOCOL])
+    ws.current.binaryType = 'arraybuffer'
 
     ws.current.onopen = () => {
       setIsConnected(true)
@@ -58,6 +69,25 @@ export function useWebSocket({
     }
 
     ws.current.onmessage = (event) => {
+      if (ws.current?.protocol === MSGPACK_SUBPROTOCOL) {
+        try {
+          const data = decode(event.data as ArrayBuffer) as WebSocketMessage
+          if (data.type === 'chunk' && data.data instanceof Uint8Array) {
+            const chunk = data.data
+            onBinaryRef.current?.(chunk.buffer.slice(chunk.byteOffset, chunk.byteOffset + chunk.byteLength) as ArrayBuffer)
+          } else {
+            onMessageRef.current?.(data)
+          }
+        } catch (error) {
+          console.error('Failed to decode WebSocket message:', error)
+        }
+        return
+      }
+      // Binary frames carry streamed media (e.g. speech audio chunks)
+      if (event.data instanceof ArrayBuffer) {
+        onBinaryRef.current?.(event.data)
+        return
+      }
       try {
         const data = JSON.parse(event.data) as WebSocketMessage
         onMessageRef.current?.(data)
@@ -88,7 +118,9 @@ export function useWebSocket({
 
   const sendMessage = useCallback((message: object) => {
     if (ws.current?.readyState === WebSocket.OPEN) {
-      ws.current.send(JSON.stringify(message))
+      ws.current.send(
+        ws.current.protocol === MSGPACK_SUBPROTOCOL ? encode(message) : JSON.stringify(message)
+      )
     } else {
       console.warn('WebSocket is not connected')
     }
@@ -0,0 +1,106 @@
+"""
+WebSocket message framing for the chat endpoint.
+
+Control messages (text, done, ping/pong, ...) are dicts. Clients that offer
+the "vidchat.msgpack" subprotocol get them as msgpack in binary frames;
+everyone else gets JSON text frames. Media chunks are raw binary frames in
+JSON mode and {"type": "chunk", "data": <bin>} messages in msgpack mode
+(where every binary frame is msgpack).
+
+All sends go through one writer task per connection, fed by a bounded queue:
+producers never write to the socket concurrently, and a slow client applies
+backpressure (send() waits) instead of piling up pending send coroutines.
+"""
+import asyncio
+import json
+from typing import Any, Optional
+
+from fastapi import WebSocket
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+MSGPACK_SUBPROTOCOL = "vidchat.msgpack"
+
+# Outgoing messages that may be queued per connection before send() waits
+SEND_QUEUE_SIZE = 64
+
+
+class MessageChannel:
+    """Sends and receives control messages in the format negotiated for a connection."""
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.use_msgpack = False
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self._writer: Optional[asyncio.Task] = None
+        self._error: Optional[Exception] = None
+
+    async def accept(self):
+        """Accept the connection, choosing msgpack if the client offers it, and start the writer."""
+        offered = self.websocket.scope.get("subprotocols", [])
+        self.use_msgpack = MSGPACK_AVAILABLE and MSGPACK_SUBPROTOCOL in offered
+        await self.websocket.accept(subprotocol=MSGPACK_SUBPROTOCOL if self.use_msgpack else None)
+        self._writer = asyncio.create_task(self._write_loop())
+
+    async def close(self):
+        """Stop the writer task (messages still queued are dropped)."""
+        if self._writer:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+
+    async def _write_loop(self):
+        """Sole writer to the socket. After a send error, keeps draining so producers never block."""
+        while True:
+            kind, payload = await self._queue.get()
+            try:
+                if self._error is None:
+                    if kind == "bytes":
+                        await self.websocket.send_bytes(payload)
+                    else:
+                        await self.websocket.send_text(payload)
+            except Exception as e:
+                self._error = e
+            finally:
+                # Don't hold on to the buffer (it may be a view of a mapping being closed)
+                payload = None
+                self._queue.task_done()
+
+    async def _enqueue(self, kind: str, payload):
+        if self._error is not None:
+            raise self._error
+        await self._queue.put((kind, payload))
+
+    async def drain(self):
+        """Wait until everything queued so far has been written."""
+        await self._queue.join()
+        if self._error is not None:
+            raise self._error
+
+    async def send(self, message: dict[str, Any]):
+        """Queue a control message."""
+        if self.use_msgpack:
+            await self._enqueue("bytes", msgpack.packb(message, use_bin_type=True))
+        else:
+            await self._enqueue("text", json.dumps(message, separators=(",", ":"), ensure_ascii=False))
+
+    async def send_chunk(self, chunk: bytes | memoryview):
+        """Queue one chunk of streamed media. Buffers must stay valid until drain()."""
+        if self.use_msgpack:
+            await self.send({"type": "chunk", "data": chunk})
+        else:
+            await self._enqueue("bytes", chunk)
+
+    async def receive(self) -> dict[str, Any]:
+        """Receive a control message."""
+        if self.use_msgpack:
+            return msgpack.unpackb(await self.websocket.receive_bytes(), raw=False)
+        return await self.websocket.receive_json()
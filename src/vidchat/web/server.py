@@ -4,32 +4,61 @@ FastAPI web server for VidChat with WebSocket support.
 Handles text chat, audio streaming, and avatar frame streaming.
 """
 import asyncio
-import base64
-import io
-import logging
+import functools
+import json
+import mmap
+import multiprocessing
+import os
+import re
+import shutil
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
-import cv2
-import numpy as np
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 
+from ..avatar import sadtalker_worker
 from ..core.agent import VidChatAgent
+from ..core.response_cache import ResponseCache, cache_context
 from ..config import default_config
 from ..utils import setup_logger
+from .protocol import MessageChannel
+
+try:
+    import aiofiles
+    AIOFILES_AVAILABLE = True
+except ImportError:
+    AIOFILES_AVAILABLE = False
 
 
 logger = setup_logger("vidchat.web")
 
+# Largest message accepted from a client, and the cap on open connections +
+# in-flight requests (bounds the server's receive buffer memory)
+WS_MAX_SIZE = 4 * 1024 * 1024
+LIMIT_CONCURRENCY = 100
+
+# Size of binary WebSocket frames used to stream speech audio
+AUDIO_CHUNK_SIZE = 16 * 1024
+
+# Ids the client can fetch from /api/video/<id>: the file stem of a video in
+# cache.video_dir (generated) or cache.cache_dir (cached responses). Derived
+# from disk, so any server process can serve any id.
+VIDEO_ID = re.compile(r"[0-9a-f]{32,64}")
+
 
 # API Models
 class ChatMessage(BaseModel):
     message: str
     session_id: Optional[str] = None
+    stream: bool = False  # Stream the response as server-sent events
 
 
 class ChatResponse(BaseModel):
@@ -37,6 +66,19 @@ class ChatResponse(BaseModel):
     audio_url: Optional[str] = None
 
 
+@dataclass
+class InferenceJob:
+    """Speech + video generation for one response, run by the inference worker.
+
+    `audio` resolves to the speech file as soon as TTS is done, `result` to
+    (audio_path, video_path) once the video is rendered. Await them in order.
+    """
+    agent: "VidChatAgent"
+    text: str
+    audio: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+    result: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+
+
 # FastAPI app
 app = FastAPI(
     title="VidChat Web API",
@@ -53,14 +95,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global agent instance (consider session management for multi-user)
+# Global agent instance, shared by all connections (GPU work goes through the inference queue)
 vidchat_agent: Optional[VidChatAgent] = None
 
+# Cached responses (text + audio + video) for repeated prompts
+response_cache: Optional[ResponseCache] = None
+
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize VidChat agent on startup."""
-    global vidchat_agent
+    global vidchat_agent, response_cache
+    Path(default_config.cache.video_dir).mkdir(parents=True, exist_ok=True)
+    if default_config.cache.enabled:
+        try:
+            response_cache = ResponseCache(default_config.cache, context=cache_context(default_config))
+        except Exception as e:
+            logger.error(f"Failed to initialize response cache: {e}")
+            response_cache = None
+
     logger.info("Initializing VidChat agent...")
     try:
         vidchat_agent = VidChatAgent(config=default_config)
@@ -69,12 +122,57 @@ async def startup_event():
         logger.error(f"Failed to initialize VidChat agent: {e}")
         vidchat_agent = None
 
+    # Warm SadTalker workers keep models loaded and run inference off the event loop
+    app.state.sadtalker_pool = None
+    workers = default_config.avatar.sadtalker_workers
+    if vidchat_agent and workers > 0:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),  # CUDA can't be used after fork
+            initializer=functools.partial(
+                sadtalker_worker.init_worker,
+                # Workers chdir into the SadTalker repo, so pass absolute paths
+                sadtalker_path=str(vidchat_agent.avatar.sadtalker_path.resolve()),
+                preprocess=default_config.avatar.sadtalker_preprocess or "crop",
+                compile_generator=default_config.avatar.sadtalker_compile,
+                precision=default_config.avatar.sadtalker_precision,
+                source_cache_dir=(
+                    str(Path(default_config.cache.source_coeff_dir).resolve())
+                    if default_config.cache.enabled and default_config.cache.source_coeff_dir
+                    else None
+                ),
+            ),
+        )
+        # Start the workers now so model loading doesn't delay the first request
+        for _ in range(workers):
+            pool.submit(sadtalker_worker.warm_up)
+        app.state.sadtalker_pool = pool
+        logger.info(f"Started {workers} SadTalker worker(s)")
+
+    # All connections share the agent's models; one consumer runs GPU jobs serially
+    app.state.inference_queue = asyncio.Queue()
+    app.state.inference_task = asyncio.create_task(_inference_worker(app.state.inference_queue))
+
+    # Render common prompts in the background; the server is usable meanwhile
+    app.state.precache_task = None
+    if vidchat_agent and response_cache and default_config.cache.precache_prompts:
+        app.state.precache_task = asyncio.create_task(
+            _precache_prompts(vidchat_agent, default_config.cache.precache_prompts)
+        )
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     global vidchat_agent
     logger.info("Shutting down VidChat web server")
+    for name in ("precache_task", "inference_task"):
+        task = getattr(app.state, name, None)
+        if task:
+            task.cancel()
+    pool = getattr(app.state, "sadtalker_pool", None)
+    if pool:
+        pool.shutdown(wait=False, cancel_futures=True)
 
 
 @app.get("/")
@@ -102,10 +200,16 @@ async def chat(message: ChatMessage):
 
     Note: This is a simpler REST endpoint. For real-time streaming,
     use the WebSocket endpoint instead.
+
+    With "stream": true the response is text/event-stream: one
+    `data: {"delta": "..."}` event per text chunk, then `event: done`.
     """
     if not vidchat_agent:
         raise HTTPException(status_code=503, detail="VidChat agent not initialized")
 
+    if message.stream:
+        return StreamingResponse(_chat_events(message.message), media_type="text/event-stream")
+
     try:
         # Get AI response
         response_text = await vidchat_agent.chat(message.message)
@@ -119,106 +223,152 @@ async def chat(message: ChatMessage):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _chat_events(user_message: str):
+    """Server-sent events for a streamed chat response."""
+    try:
+        async for delta in vidchat_agent.chat_stream(user_message):
+            yield f"data: {json.dumps({'delta': delta})}\n\n"
+    except Exception as e:
+        logger.error(f"Error in chat stream: {e}")
+        yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+        return
+    yield "event: done\ndata: {}\n\n"
+
+
+async def _stream_response_text(channel: MessageChannel, agent: VidChatAgent, user_message: str) -> str:
+    """Forward LLM text deltas to the client as they arrive. Returns the full response."""
+    parts = []
+    async for delta in agent.chat_stream(user_message):
+        parts.append(delta)
+        await channel.send({"type": "text_delta", "content": delta})
+    return "".join(parts)
+
+
 @app.websocket("/ws/chat")
 async def websocket_chat(websocket: WebSocket):
     """
     WebSocket endpoint for real-time chat with audio streaming.
 
-    Protocol:
+    Protocol (JSON text frames, or msgpack binary frames when the client
+    offers the "vidchat.msgpack" subprotocol; see protocol.py):
     - Client sends: {"type": "message", "content": "user message"}
-    - Server sends: {"type": "text", "content": "AI response"}
-    - Server sends: {"type": "audio", "data": "base64_audio", "format": "wav"}
+    - Server sends: {"type": "text_delta", "content": "..."} while the response
+      is generated, then {"type": "text", "content": "AI response"}
+    - Server sends: {"type": "audio_start", "format": "wav", "size": N},
+      then the WAV as binary frames, then {"type": "audio_end"}
+    - Server sends: {"type": "video_url", "url": "/api/video/<id>"}
+      (the client fetches the MP4 over HTTP)
     - Server sends: {"type": "done"}
     """
-    await websocket.accept()
-    logger.info("WebSocket connection established")
+    channel = MessageChannel(websocket)
+    await channel.accept()
+    logger.info(f"WebSocket connection established ({'msgpack' if channel.use_msgpack else 'json'})")
 
     try:
         while True:
             # Receive message from client
-            data = await websocket.receive_json()
+            data = await channel.receive()
 
             if data.get("type") == "message":
                 user_message = data.get("content", "")
                 logger.info(f"Received message: {user_message[:50]}...")
 
                 if not vidchat_agent:
-                    await websocket.send_json({
+                    await channel.send({
                         "type": "error",
                         "content": "VidChat agent not initialized"
                     })
                     continue
 
                 try:
-                    # Get AI response
-                    response_text = await vidchat_agent.chat(user_message)
-
-                    # Send text response
-                    await websocket.send_json({
+                    # Serve repeated (or near-identical) prompts from the cache
+                    cached = None
+                    if response_cache:
+                        cached = await asyncio.to_thread(response_cache.get, user_message)
+                    if cached and cached.video_path:
+                        logger.info("Serving response from cache")
+                        await channel.send({
+                            "type": "text",
+                            "content": cached.response_text
+                        })
+                        await _send_video_url(channel, cached.video_path)
+                        await channel.send({"type": "done"})
+                        continue
+
+                    # Get AI response, streaming it to the client as it is generated
+                    response_text = await _stream_response_text(channel, vidchat_agent, user_message)
+
+                    # Send the complete text response
+                    await channel.send({
                         "type": "text",
                         "content": response_text
                     })
 
                     # Generate and send video with SadTalker
-                    await _handle_sadtalker_response(websocket, vidchat_agent, response_text)
+                    await _handle_sadtalker_response(
+                        channel, vidchat_agent, response_text, prompt=user_message
+                    )
 
                     # Send completion signal
-                    await websocket.send_json({"type": "done"})
+                    await channel.send({"type": "done"})
 
                 except Exception as e:
                     logger.error(f"Error processing message: {e}", exc_info=True)
-                    await websocket.send_json({
+                    await channel.send({
                         "type": "error",
                         "content": f"Error: {str(e)}"
                     })
 
             elif data.get("type") == "ping":
-                await websocket.send_json({"type": "pong"})
+                await channel.send({"type": "pong"})
 
     except WebSocketDisconnect:
         logger.info("WebSocket connection closed")
     except Exception as e:
         logger.error(f"WebSocket error: {e}", exc_info=True)
+    finally:
+        await channel.close()
 
 
-async def _handle_sadtalker_response(websocket: WebSocket, agent: VidChatAgent, text: str):
+async def _handle_sadtalker_response(
+    channel: MessageChannel, agent: VidChatAgent, text: str, prompt: Optional[str] = None
+):
     """
     Handle response using SadTalker video generation.
 
     Workflow:
-    1. Generate audio from text
-    2. Use SadTalker to generate video (image + audio → video)
-    3. Send video to client
+    1. Generate audio from text, while SadTalker extracts the source image's
+       coefficients (cached after the first request)
+    2. Stream the audio to the client, which starts playing it
+    3. Use SadTalker to generate video (image + audio → video)
+    4. Send the client a URL for the video
+    5. Cache the result under the user's prompt (if given)
     """
-    import os
-
     try:
-        # Generate speech audio
-        logger.info("Generating speech audio...")
-        audio_path = agent.generate_speech(text)
-
-        # Generate video using SadTalker
-        logger.info("Generating SadTalker video (this takes ~30-60 seconds)...")
-        video_path = agent.avatar.generate_video(audio_path)
-
-        # Read and encode video
-        with open(video_path, 'rb') as f:
-            video_data = f.read()
-            video_base64 = base64.b64encode(video_data).decode('utf-8')
-
-            # Send video to client
-            await websocket.send_json({
-                "type": "video",
-                "data": video_base64,
-                "format": "mp4"
-            })
+        # Queue speech + video generation behind other connections' jobs
+        job = InferenceJob(agent, text)
+        await app.state.inference_queue.put(job)
+
+        # Play the speech while the video renders
+        await _send_audio(channel, await job.audio)
+        audio_path, video_path = await job.result
+
+        # Point the client at the video
+        video_path = await asyncio.to_thread(_move_to_video_dir, video_path)
+        await _send_video_url(channel, video_path)
+        await asyncio.to_thread(_evict_served_videos)
 
         logger.info("Video sent to client")
 
+        if response_cache and prompt:
+            try:
+                await asyncio.to_thread(response_cache.put, prompt, text, audio_path, str(video_path))
+            except Exception as e:
+                logger.warning(f"Failed to cache response: {e}")
+
         # Cleanup
         try:
             os.unlink(audio_path)
-            os.unlink(video_path)
         except:
             pass
 
@@ -227,6 +377,217 @@ async def _handle_sadtalker_response(websocket: WebSocket, agent: VidChatAgent,
         raise
 
 
+async def _inference_worker(queue: asyncio.Queue):
+    """
+    Run queued inference jobs one at a time.
+
+    Concurrent clients would otherwise interleave TTS and SadTalker calls on
+    the same models and contend for the CUDA context. WebSocket handlers stay
+    concurrent; only the GPU work is serialized.
+    """
+    while True:
+        job: InferenceJob = await queue.get()
+        try:
+            if job.result.cancelled():
+                continue
+            job.result.set_result(await _run_inference(job))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if not job.audio.done():
+                # Callers stop at the audio future, nobody awaits the result
+                job.audio.set_exception(e)
+                job.result.cancel()
+            elif not job.result.done():
+                job.result.set_exception(e)
+        finally:
+            queue.task_done()
+
+
+async def _precache_prompts(agent: VidChatAgent, prompts: list[str]):
+    """
+    Answer and render prompts that aren't cached yet, storing them in the cache.
+
+    Jobs go through the inference queue like user requests. The first one
+    also pays the cuDNN autotuning / compilation warm-up, so real users don't.
+    """
+    for prompt in prompts:
+        try:
+            if await asyncio.to_thread(response_cache.get, prompt):
+                continue
+            response_text = await agent.chat(prompt)
+            job = InferenceJob(agent, response_text)
+            await app.state.inference_queue.put(job)
+            await job.audio
+            audio_path, video_path = await job.result
+            await asyncio.to_thread(response_cache.put, prompt, response_text, audio_path, video_path)
+            for path in (audio_path, video_path):
+                os.unlink(path)
+            logger.info(f"Pre-cached response for: {prompt}")
+        except Exception as e:
+            logger.warning(f"Failed to pre-cache '{prompt}': {e}")
+
+
+async def _run_inference(job: InferenceJob) -> tuple[str, str]:
+    """Generate speech and avatar video for a job. Returns (audio_path, video_path)."""
+    agent = job.agent
+
+    # Generate speech audio
+    logger.info("Generating speech audio...")
+    audio_path, _ = await asyncio.gather(
+        asyncio.to_thread(agent.generate_speech, job.text),
+        _preextract_source_image(agent),
+    )
+    if not job.audio.cancelled():
+        job.audio.set_result(audio_path)
+
+    # Generate video using SadTalker
+    logger.info("Generating SadTalker video (this takes ~30-60 seconds)...")
+    video_path = await _generate_video(agent, audio_path)
+    return audio_path, video_path
+
+
+async def _preextract_source_image(agent: VidChatAgent):
+    """Warm the worker's source image coefficients; a no-op without the pool."""
+    pool = getattr(app.state, "sadtalker_pool", None)
+    if not pool:
+        return
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(
+            pool, functools.partial(sadtalker_worker.preextract, **agent.avatar.preextract_options())
+        )
+    except Exception as e:
+        # generate() extracts (and reports) it again
+        logger.warning(f"Source image pre-extraction failed: {e}")
+
+
+async def _generate_video(agent: VidChatAgent, audio_path: str) -> str:
+    """Generate the avatar video without blocking the event loop.
+
+    Uses the warm SadTalker worker pool when available, otherwise runs the
+    renderer (one inference.py subprocess per call) in a thread.
+    """
+    pool = getattr(app.state, "sadtalker_pool", None)
+    if pool:
+        loop = asyncio.get_running_loop()
+        audio_bytes = await _read_file(audio_path)
+        try:
+            video_bytes = await loop.run_in_executor(
+                pool,
+                functools.partial(sadtalker_worker.generate, audio_bytes, **agent.avatar.worker_options()),
+            )
+        except BrokenProcessPool:
+            logger.error("SadTalker worker pool died, falling back to per-request inference")
+            app.state.sadtalker_pool = None
+        else:
+            # Written straight to where it will be served from
+            video_path = Path(default_config.cache.video_dir) / f"{uuid.uuid4().hex}.mp4"
+            await _write_file(video_path, video_bytes)
+            return str(video_path)
+
+    return await asyncio.to_thread(agent.avatar.generate_video, audio_path)
+
+
+async def _send_audio(channel: MessageChannel, audio_path: str):
+    """Stream a WAV file as binary chunks between audio_start and audio_end."""
+    size = os.path.getsize(audio_path)
+    await channel.send({
+        "type": "audio_start",
+        "format": "wav",
+        "size": size
+    })
+    # The WAV was just written, so it is in the page cache: map it and send
+    # slices of the mapping instead of copying each chunk into a new bytes
+    if size:
+        mm = await asyncio.to_thread(_map_file, audio_path)
+        view = memoryview(mm)
+        chunk = None
+        try:
+            for offset in range(0, size, AUDIO_CHUNK_SIZE):
+                chunk = view[offset:offset + AUDIO_CHUNK_SIZE]
+                await channel.send_chunk(chunk)
+            # Queued slices reference the mapping
+            await channel.drain()
+        finally:
+            chunk = None
+            try:
+                view.release()
+                mm.close()
+            except BufferError:
+                # A failed send left slices queued; the mapping closes once
+                # they are dropped, and the send error propagates
+                pass
+    await channel.send({"type": "audio_end"})
+
+
+def _map_file(path: str) -> mmap.mmap:
+    """Map a non-empty file read-only (the mapping outlives the file object)."""
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ)
+
+
+async def _read_file(path: str | Path) -> bytes:
+    """Read a file without blocking the event loop."""
+    if AIOFILES_AVAILABLE:
+        async with aiofiles.open(path, 'rb') as f:
+            return await f.read()
+    return await asyncio.to_thread(Path(path).read_bytes)
+
+
+async def _write_file(path: str | Path, data: bytes):
+    """Write a file without blocking the event loop."""
+    if AIOFILES_AVAILABLE:
+        async with aiofiles.open(path, 'wb') as f:
+            await f.write(data)
+    else:
+        await asyncio.to_thread(Path(path).write_bytes, data)
+
+
+def _move_to_video_dir(video_path: str) -> Path:
+    """Move a generated video into the served video directory (if it isn't there yet)."""
+    video_dir = Path(default_config.cache.video_dir)
+    if Path(video_path).parent == video_dir:
+        return Path(video_path)
+    dest = video_dir / f"{uuid.uuid4().hex}.mp4"
+    shutil.move(video_path, dest)
+    return dest
+
+
+def _evict_served_videos():
+    """Delete the oldest generated videos beyond cache.max_served_videos (by mtime)."""
+    videos = []
+    for path in Path(default_config.cache.video_dir).glob("*.mp4"):
+        try:
+            videos.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue  # Evicted by another server process
+    videos.sort(reverse=True)
+    for _, path in videos[default_config.cache.max_served_videos:]:
+        path.unlink(missing_ok=True)
+
+
+async def _send_video_url(channel: MessageChannel, video_path: str | Path):
+    """Send the client the URL of a video in the video or cache directory.
+
+    The MP4 goes over plain HTTP (FileResponse), which streams it from disk
+    and lets the browser range-request it, instead of through the WebSocket.
+    """
+    vid = Path(video_path).stem
+    await channel.send({"type": "video_url", "url": f"/api/video/{vid}"})
+
+
+@app.get("/api/video/{vid}")
+async def get_video(vid: str):
+    """Serve a generated or cached video by id."""
+    if VIDEO_ID.fullmatch(vid):
+        for directory in (default_config.cache.video_dir, default_config.cache.cache_dir):
+            path = Path(directory) / f"{vid}.mp4"
+            if path.exists():
+                return FileResponse(path, media_type="video/mp4")
+    raise HTTPException(status_code=404, detail="Video not found")
+
+
 @app.get("/api/config")
 async def get_config():
     """Get current VidChat configuration."""
@@ -240,6 +601,10 @@ async def get_config():
         "tts": {
             "provider": vidchat_agent.config.tts.provider,
             "sample_rate": vidchat_agent.config.tts.sample_rate,
+            # Piper's onnxruntime provider (HybridTTS wraps Piper as base_tts)
+            "execution_provider": getattr(
+                getattr(vidchat_agent.tts, "base_tts", vidchat_agent.tts), "execution_provider", None
+            ),
         }
     }
 
@@ -254,11 +619,17 @@ def start_server(host: str = "0.0.0.0", port: int = 8000, reload: bool = False):
     """
     Start the FastAPI server.
 
+    Always a single server process: the agent, SadTalker pool, inference
+    queue and response cache index are per-process state, and each extra
+    process would load its own copy of the models.
+
     Args:
         host: Host to bind to
         port: Port to bind to
         reload: Enable auto-reload for development
     """
+    import importlib.util
+
     import uvicorn
 
     logger.info(f"Starting VidChat web server on {host}:{port}")
@@ -267,7 +638,15 @@ def start_server(host: str = "0.0.0.0", port: int = 8000, reload: bool = False):
         host=host,
         port=port,
         reload=reload,
-        log_level="info"
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        ws="websockets",
+        # Media frames are already compressed; deflating them only burns CPU
+        ws_per_message_deflate=False,
+        # Clients only send short control messages; cap per-connection buffering
+        ws_max_size=WS_MAX_SIZE,
+        limit_concurrency=LIMIT_CONCURRENCY,
+        log_level="warning"
     )
 
 